@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 """RHOAI Container Image Reporter - Main CLI application."""
 
+import json
 import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import click
 import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 
 # Add src directory to path for imports
 src_path = str(Path(__file__).parent / "src")
@@ -17,18 +21,34 @@ sys.path.insert(0, src_path)
 
 # Import with absolute imports
 import analyzer
+import cache
+import engine
 import exceptions
 import github_client
+import index
+import mirror_plan
 import parsers
+import registry_client
 import reporter
+import sources
 
 ImageAnalyzer = analyzer.ImageAnalyzer
+AnalysisEngine = engine.AnalysisEngine
+ClassificationCache = cache.ClassificationCache
+ParsedCache = cache.ParsedCache
+ResolutionCache = cache.ResolutionCache
 RHOAIReporterError = exceptions.RHOAIReporterError
 VersionNotFoundError = exceptions.VersionNotFoundError
 GitHubAPIClient = github_client.GitHubAPIClient
+DigestIndex = index.DigestIndex
+MirrorPlanner = mirror_plan.MirrorPlanner
 DisconnectedHelperParser = parsers.DisconnectedHelperParser
 OLMCatalogParser = parsers.OLMCatalogParser
+RegistryClient = registry_client.RegistryClient
 ReportGenerator = reporter.ReportGenerator
+GitHubSourceBackend = sources.GitHubSourceBackend
+LocalSourceBackend = sources.LocalSourceBackend
+SourceFile = sources.SourceFile
 
 console = Console()
 
@@ -36,15 +56,85 @@ console = Console()
 class RHOAIReporter:
     """Main RHOAI container image reporter application."""
 
-    def __init__(self, config_path: str = "config.yaml"):
+    # Upper bound on concurrent source fetches (current + comparison version)
+    max_fetch_workers = 4
+
+    def __init__(self, config_path: str = "config.yaml", use_cache: bool = True,
+                 snapshot_ref: Optional[str] = None, source: Optional[str] = None, jobs: Optional[int] = None,
+                 index_path: Optional[str] = None, mirror_size: bool = False):
         self.config = self._load_config(config_path)
-        self.github_client = GitHubAPIClient()
-        self.olm_parser = OLMCatalogParser()
-        self.markdown_parser = DisconnectedHelperParser()
-        self.analyzer = ImageAnalyzer()
+        self.snapshot_ref = snapshot_ref
+        self.jobs = jobs
+        defaults = self.config.get('defaults', {})
+        self.index_path = index_path or defaults.get('index_path')
+        github = self.config.get('github') or {}
+        self.github_client = GitHubAPIClient(
+            token=github.get('token'),
+            tokens=github.get('tokens'),
+            cache_dir=defaults.get('cache_dir') if use_cache else None,
+            cache_duration=defaults.get('cache_duration', 3600),
+            requests_per_second=github.get('requests_per_second', 10.0),
+            max_retries=github.get('max_retries', 5),
+            timeout=github.get('timeout', 30)
+        )
+        self.source = self._create_source_backend(source)
+        self.cache_dir = defaults.get('cache_dir') if use_cache else None
+        self.parsed_cache_max_bytes = int(defaults.get('parsed_cache_max_mb', 256)) * 1024 * 1024
+        parsed_cache = ParsedCache(self.cache_dir, max_bytes=self.parsed_cache_max_bytes) if self.cache_dir else None
+        self.olm_parser = OLMCatalogParser(cache=parsed_cache, jobs=1 if jobs is None else jobs)
+        self.markdown_parser = DisconnectedHelperParser(cache=parsed_cache)
+        # Classification results are always memoized in memory, and persisted when caching is on
+        self.analyzer = ImageAnalyzer(ClassificationCache(defaults.get('cache_dir') if use_cache else None))
+        self.registry_client = None
+        if mirror_size:
+            registry = self.config.get('registry') or {}
+            auth_files = registry_client.default_auth_files()
+            if registry.get('auth_file'):
+                auth_files.insert(0, registry['auth_file'])
+            self.registry_client = RegistryClient(
+                cache_dir=self.cache_dir,
+                max_workers=registry.get('max_workers', 8),
+                timeout=registry.get('timeout', 30),
+                insecure_registries=registry.get('insecure'),
+                credentials=registry_client.load_credentials(auth_files)
+            )
         self.reporter = ReportGenerator()
 
-    def _load_config(self, config_path: str) -> dict:
+    def close(self) -> None:
+        """Persist memoized lookups and release snapshot directories and network connections."""
+        if self.source.resolutions:
+            self.source.resolutions.close()
+        self.github_client.close()
+
+    def _create_source_backend(self, source: Optional[str]):
+        """Create the source backend selected on the CLI or in the config."""
+        repositories = self.config.get('repositories', {})
+        source_config = self.config.get('sources') or {}
+        source = source or source_config.get('backend', 'github')
+        build_repo = repositories.get('build_config', sources.BUILD_CONFIG_REPO)
+        helper_repo = repositories.get('disconnected_helper', sources.DISCONNECTED_HELPER_REPO)
+
+        if source == 'local':
+            local_paths = source_config.get('local') or {}
+            paths = {
+                build_repo: local_paths.get('build_config', ''),
+                helper_repo: local_paths.get('disconnected_helper', '')
+            }
+            # With a local backend, --snapshot selects the git ref to read from the clones
+            return LocalSourceBackend(paths, ref=self.snapshot_ref,
+                                      build_config_repo=build_repo, helper_repo=helper_repo)
+
+        backend = GitHubSourceBackend(self.github_client, build_config_repo=build_repo, helper_repo=helper_repo)
+        if self.github_client.cache:
+            backend.resolutions = ResolutionCache(
+                self.github_client.cache.cache_dir,
+                ttl=self.github_client.cache.max_age,
+                scope=f"github|{build_repo}|{helper_repo}|{self.snapshot_ref or ''}"
+            )
+        return backend
+
+    @staticmethod
+    def _load_config(config_path: str) -> dict:
         """Load configuration from YAML file."""
         try:
             with open(config_path, 'r') as f:
@@ -58,7 +148,10 @@ class RHOAIReporter:
                 },
                 'defaults': {
                     'output_format': 'markdown',
-                    'include_security_analysis': True
+                    'include_security_analysis': True,
+                    'cache_duration': 3600,
+                    'cache_dir': '~/.cache/rhoai-reporter',
+                    'parsed_cache_max_mb': 256
                 }
             }
 
@@ -75,13 +168,24 @@ class RHOAIReporter:
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
-        ) as progress:
+        ) as progress, ExitStack() as open_sources:
+
+            # Pull both repositories once so every later read is served locally
+            if self.snapshot_ref and isinstance(self.source, GitHubSourceBackend):
+                task = progress.add_task(f"Snapshotting source repositories at {self.snapshot_ref}...", total=None)
+                try:
+                    self.source.snapshot(self.snapshot_ref)
+                    progress.update(task, description="Source repositories snapshotted")
+                except Exception as e:
+                    progress.stop()
+                    console.print(f"[red]Error snapshotting source repositories: {e}[/red]")
+                    return
 
             # Determine versions
             if not rhoai_version or not ocp_version:
                 task = progress.add_task("Determining latest versions...", total=None)
                 try:
-                    latest_rhoai, latest_ocp = self.github_client.get_latest_versions()
+                    latest_rhoai, latest_ocp = self.source.get_latest_versions()
                     rhoai_version = rhoai_version or latest_rhoai
                     ocp_version = ocp_version or latest_ocp
                     progress.update(task, description=f"Using RHOAI {rhoai_version} / OCP {ocp_version}")
@@ -90,35 +194,43 @@ class RHOAIReporter:
                     console.print(f"[red]Error determining versions: {e}[/red]")
                     return
 
-            # Fetch OLM catalog data
-            task = progress.add_task("Fetching OLM catalog data...", total=None)
+            # Fetch all independent sources concurrently
+            task = progress.add_task("Fetching source data...", total=None)
+            with ThreadPoolExecutor(max_workers=self.max_fetch_workers) as executor:
+                olm_future = executor.submit(self.source.open_olm_catalog, rhoai_version, ocp_version)
+                helper_future = executor.submit(self.source.open_disconnected_helper, rhoai_version)
+                if compare_with:
+                    comparison_olm_future = executor.submit(
+                        self.source.open_olm_catalog, compare_with, ocp_version)
+                    comparison_helper_future = executor.submit(
+                        self.source.open_disconnected_helper, compare_with)
+            # Sources not parsed because of an error or an early return are still closed
+            fetch_futures = [olm_future, helper_future]
+            if compare_with:
+                fetch_futures += [comparison_olm_future, comparison_helper_future]
+            open_sources.callback(self._close_sources, fetch_futures)
+            progress.update(task, description="Source data fetched")
+
+            # OLM catalog data, parsed straight from the source stream
             try:
-                olm_content = self.github_client.get_olm_catalog(rhoai_version, ocp_version)
-                progress.update(task, description="OLM catalog data fetched")
+                olm_file = olm_future.result()
             except Exception as e:
                 progress.stop()
                 console.print(f"[red]Error fetching OLM catalog: {e}[/red]")
                 return
 
-            # Fetch disconnected helper data
-            task = progress.add_task("Fetching disconnected helper data...", total=None)
+            # Disconnected helper data
             try:
-                helper_content = self.github_client.get_disconnected_helper(rhoai_version)
-                progress.update(task, description="Disconnected helper data fetched")
+                helper_file = helper_future.result()
             except Exception as e:
                 progress.stop()
                 console.print(f"[yellow]Warning: Could not fetch disconnected helper data: {e}[/yellow]")
-                helper_content = ""
+                helper_file = None
 
             # Parse data
             task = progress.add_task("Parsing image data...", total=None)
             try:
-                olm_images = self.olm_parser.parse_catalog(olm_content)
-                helper_images = []
-                if helper_content:
-                    helper_images = self.markdown_parser.parse_markdown(helper_content)
-
-                all_images = olm_images + helper_images
+                all_images = self._parse_sources(olm_file, helper_file)
                 progress.update(task, description=f"Parsed {len(all_images)} images")
 
                 if not all_images:
@@ -141,20 +253,27 @@ class RHOAIReporter:
                 console.print(f"[red]Error analyzing images: {e}[/red]")
                 return
 
+            if self.registry_client:
+                task = progress.add_task("Sizing images from registry manifests...", total=None)
+                self._add_mirror_sizes([analysis], progress, task)
+
+            if self.index_path:
+                task = progress.add_task("Updating digest index...", total=None)
+                self._record_in_index([analysis], progress, task)
+
             # Generate comparison if requested
             if compare_with:
                 task = progress.add_task(f"Comparing with version {compare_with}...", total=None)
                 try:
-                    # Fetch comparison data (simplified for now)
-                    comparison_olm = self.github_client.get_olm_catalog(compare_with, ocp_version)
-                    comparison_helper = ""
+                    # Comparison data was fetched alongside the current version
+                    comparison_olm = comparison_olm_future.result()
+                    comparison_helper = None
                     try:
-                        comparison_helper = self.github_client.get_disconnected_helper(compare_with)
+                        comparison_helper = comparison_helper_future.result()
                     except:
                         pass
 
-                    comparison_images = (self.olm_parser.parse_catalog(comparison_olm) +
-                                       (self.markdown_parser.parse_markdown(comparison_helper) if comparison_helper else []))
+                    comparison_images = self._parse_sources(comparison_olm, comparison_helper)
 
                     analysis.comparison = self.analyzer.compare_versions(all_images, comparison_images)
                     progress.update(task, description=f"Comparison with {compare_with} complete")
@@ -171,28 +290,231 @@ class RHOAIReporter:
                 console.print(f"[red]Error generating report: {e}[/red]")
                 return
 
+        stats = self.github_client.request_stats()
+        if stats['retries'] or stats['waits']:
+            console.print(f"[dim]GitHub requests: {stats['requests']}, retries: {stats['retries']}, "
+                          f"rate-limit waits: {stats['waits']} ({stats['wait_seconds']:.1f}s)[/dim]")
+
         # Output report
+        if output_format == "json":
+            self._write_output(report.summary, output_file, raw=True)
+        else:
+            self._write_output(report.summary + "\n" + report.detailed_breakdown + "\n" + report.security_report,
+                               output_file)
+
+    @staticmethod
+    def _close_sources(futures: List[Future]) -> None:
+        """Close the SourceFile of every fetch that succeeded; closing twice is harmless."""
+        for future in futures:
+            if future.done() and not future.exception():
+                future.result().stream.close()
+
+    def _parse_sources(self, olm_file: SourceFile, helper_file: Optional[SourceFile]) -> List:
+        """Parse an OLM catalog and an optional helper list from their streams, closing both.
+
+        Blob SHAs known to the source backend key the parsed cache, so cached
+        files are not re-hashed.
+        """
+        try:
+            with olm_file:
+                images = self.olm_parser.parse_catalog(olm_file.stream, content_key=olm_file.blob_sha)
+            if helper_file is not None:
+                images += self.markdown_parser.parse_markdown(helper_file.stream, content_key=helper_file.blob_sha)
+        finally:
+            if helper_file is not None:
+                helper_file.stream.close()
+        return images
+
+    def generate_matrix_report(self, matrix: str, output_format: str = "markdown",
+                               output_file: Optional[str] = None) -> None:
+        """Analyze a matrix of RHOAI/OCP pairs in parallel and write one combined report."""
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+
+            if self.snapshot_ref and isinstance(self.source, GitHubSourceBackend):
+                task = progress.add_task(f"Snapshotting source repositories at {self.snapshot_ref}...", total=None)
+                try:
+                    self.source.snapshot(self.snapshot_ref)
+                    progress.update(task, description="Source repositories snapshotted")
+                except Exception as e:
+                    progress.stop()
+                    console.print(f"[red]Error snapshotting source repositories: {e}[/red]")
+                    return
+
+            pairs = self._parse_matrix(matrix)
+            if not pairs:
+                progress.stop()
+                console.print("[yellow]No RHOAI/OCP pairs found for the version matrix[/yellow]")
+                return
+
+            task = progress.add_task(f"Analyzing {len(pairs)} RHOAI/OCP pairs...", total=None)
+            matrix_engine = AnalysisEngine(self.source, workers=self.jobs or 0, cache_dir=self.cache_dir,
+                                           parsed_cache_max_bytes=self.parsed_cache_max_bytes)
+            results = matrix_engine.run(pairs)
+            failed = sum(1 for result in results if result.error)
+            progress.update(task, description=f"Analyzed {len(results) - failed} of {len(results)} pairs")
+
+            analyses = [result.analysis for result in results if result.analysis]
+            if self.registry_client:
+                task = progress.add_task("Sizing images from registry manifests...", total=None)
+                self._add_mirror_sizes(analyses, progress, task)
+
+            if self.index_path:
+                task = progress.add_task("Updating digest index...", total=None)
+                self._record_in_index(analyses, progress, task)
+
+        for result in results:
+            if result.error:
+                console.print(f"[red]RHOAI {result.rhoai_version} / OCP {result.ocp_version}: {result.error}[/red]")
+
+        self._write_output(self.reporter.generate_matrix_report(results, output_format), output_file,
+                           raw=output_format == "json")
+
+    def _add_mirror_sizes(self, analyses: List, progress: Progress, task) -> None:
+        """Attach registry-derived mirror sizes; failures leave the size estimate in place."""
+        try:
+            for analysis in analyses:
+                analysis.mirror_size = self.registry_client.mirror_size(analysis.images)
+            progress.update(task, description="Images sized from registry manifests")
+            for analysis in analyses:
+                mirror_size = analysis.mirror_size
+                unresolved = len(mirror_size.unresolved)
+                if unresolved:
+                    consequence = ("so the total is a lower bound" if mirror_size.images_sized
+                                   else "so the size is estimated")
+                    progress.console.print(
+                        f"[bold yellow]Mirror size for RHOAI {analysis.rhoai_version} / OCP {analysis.ocp_version}: "
+                        f"{unresolved} of {unresolved + mirror_size.images_sized} images could not be sized, "
+                        f"{consequence}[/bold yellow]")
+        except Exception as e:
+            progress.update(task, description=f"Mirror size calculation failed: {e}")
+
+    def _record_in_index(self, analyses: List, progress: Progress, task) -> None:
+        """Record analyzed versions in the digest index; failures only warn."""
+        try:
+            with DigestIndex(self.index_path) as digest_index:
+                recorded = sum(digest_index.record(analysis) for analysis in analyses)
+            progress.update(task, description=f"Indexed {recorded} images in {self.index_path}")
+        except Exception as e:
+            progress.update(task, description=f"Digest index update failed: {e}")
+
+    def generate_mirror_plan(self, versions: str, existing_path: Optional[str] = None,
+                             image_set_config: Optional[str] = None, list_file: Optional[str] = None,
+                             output_format: str = "markdown", output_file: Optional[str] = None) -> None:
+        """Plan a minimal mirror for several versions, incremental to an existing mirror set."""
+        try:
+            existing = mirror_plan.load_mirror_set(existing_path) if existing_path else set()
+        except Exception as e:
+            raise RHOAIReporterError(f"Error reading existing mirror set {existing_path}: {e}")
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+
+            if self.snapshot_ref and isinstance(self.source, GitHubSourceBackend):
+                task = progress.add_task(f"Snapshotting source repositories at {self.snapshot_ref}...", total=None)
+                try:
+                    self.source.snapshot(self.snapshot_ref)
+                    progress.update(task, description="Source repositories snapshotted")
+                except Exception as e:
+                    raise RHOAIReporterError(f"Error snapshotting source repositories: {e}")
+
+            try:
+                pairs = self._parse_matrix(versions)
+            except RHOAIReporterError:
+                raise
+            except Exception as e:
+                raise RHOAIReporterError(f"Error determining versions: {e}")
+            if not pairs:
+                raise RHOAIReporterError("No RHOAI/OCP versions found for the mirror plan")
+
+            task = progress.add_task(f"Collecting images of {len(pairs)} versions...", total=None)
+            matrix_engine = AnalysisEngine(self.source, workers=self.jobs or 0, cache_dir=self.cache_dir,
+                                           parsed_cache_max_bytes=self.parsed_cache_max_bytes)
+            try:
+                results = matrix_engine.run(pairs)
+            except Exception as e:
+                raise RHOAIReporterError(f"Error collecting images: {e}")
+            progress.update(task, description=f"Collected images of {len(results)} versions")
+
+        # A plan missing a version would silently under-mirror, so any failure is fatal
+        failed = [result for result in results if result.error]
+        if failed:
+            for result in failed:
+                console.print(f"[red]RHOAI {result.rhoai_version} / OCP {result.ocp_version}: {result.error}[/red]")
+            raise RHOAIReporterError("Mirror plan incomplete, see the errors above")
+
+        plan = MirrorPlanner(existing).plan(
+            [(result.rhoai_version, result.ocp_version, result.analysis.images) for result in results]
+        )
+        skipped = {reference for delta in plan.deltas for reference in delta.skipped}
+        if skipped:
+            console.print(f"[yellow]Skipped {len(skipped)} image references without a registry, "
+                          f"which cannot be mirrored[/yellow]")
+
+        if image_set_config:
+            with open(image_set_config, 'w') as f:
+                f.write(mirror_plan.image_set_configuration(plan))
+            console.print(f"[green]ImageSetConfiguration with {len(plan.images)} images saved to "
+                          f"{image_set_config}[/green]")
+        if list_file:
+            with open(list_file, 'w') as f:
+                f.write("".join(f"{reference}\n" for reference in plan.images))
+            console.print(f"[green]Mirror list with {len(plan.images)} images saved to {list_file}[/green]")
+
+        # Image references must stay on one line to be copied into mirroring tools
+        self._write_output(self.reporter.generate_mirror_plan_report(plan, output_format), output_file,
+                           raw=True)
+
+    def _parse_matrix(self, matrix: str) -> List[Tuple[str, str]]:
+        """Turn 'all' or a comma-separated list of RHOAI[:OCP] entries into version pairs.
+
+        Entries without an OCP version use the newest OCP version catalogued for that RHOAI version.
+        """
+        if matrix.strip() == 'all':
+            return self.source.get_version_matrix()
+
+        pairs = []
+        latest_ocp = None
+        for entry in matrix.split(','):
+            rhoai_version, _, ocp_version = entry.strip().partition(':')
+            if not rhoai_version:
+                raise RHOAIReporterError(f"Invalid version entry '{entry}', expected RHOAI:OCP or RHOAI")
+            if not ocp_version:
+                if latest_ocp is None:
+                    latest_ocp = dict(self.source.get_version_matrix())
+                if rhoai_version not in latest_ocp:
+                    raise VersionNotFoundError(f"No OLM catalog found for RHOAI {rhoai_version}")
+                ocp_version = latest_ocp[rhoai_version]
+            pairs.append((rhoai_version, ocp_version))
+        return pairs
+
+    def _write_output(self, content: str, output_file: Optional[str], raw: bool = False) -> None:
+        """Save a rendered report to a file, or print it to the console.
+
+        Raw content, such as JSON or a mirror plan, is printed as is rather
+        than wrapped and marked up by rich.
+        """
         if output_file:
             try:
                 with open(output_file, 'w') as f:
-                    if output_format == "json":
-                        f.write(report.summary)
-                    else:
-                        f.write(report.summary + "\n" + report.detailed_breakdown + "\n" + report.security_report)
+                    f.write(content)
                 console.print(f"[green]Report saved to {output_file}[/green]")
             except Exception as e:
                 console.print(f"[red]Error saving report: {e}[/red]")
+        elif raw:
+            click.echo(content)
         else:
-            # Print to console
-            if output_format == "json":
-                console.print(report.summary)
-            else:
-                console.print(report.summary)
-                console.print(report.detailed_breakdown)
-                console.print(report.security_report)
+            console.print(content)
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option('--rhoai-version', help='RHOAI version (e.g., 2.25)')
 @click.option('--ocp-version', help='OpenShift Container Platform version (e.g., 4.20)')
 @click.option('--compare-with', help='Compare with another RHOAI version')
@@ -202,14 +524,44 @@ class RHOAIReporter:
 @click.option('--config', 'config_path', default='config.yaml', help='Configuration file path')
 @click.option('--granular/--no-granular', default=True, help='Use granular component classification (default: True)')
 @click.option('--show-variants/--no-show-variants', default=True, help='Show detailed variant analysis (default: True)')
-def main(rhoai_version: Optional[str], ocp_version: Optional[str], compare_with: Optional[str],
-         output_format: str, output_file: Optional[str], config_path: str, granular: bool, show_variants: bool):
+@click.option('--cache/--no-cache', 'use_cache', default=True, help='Cache GitHub responses on disk (default: True)')
+@click.option('--source', type=click.Choice(['github', 'local']),
+              help='Source backend (default: sources.backend in config, else github)')
+@click.option('--snapshot', 'snapshot_ref', is_flag=False, flag_value='HEAD', default=None,
+              help='Read sources from a bulk repository snapshot at a git ref (default ref: HEAD); '
+                   'pin each repository with build=<ref>,helper=<ref>, e.g. for commit SHAs')
+@click.option('--jobs', default=None, type=click.IntRange(min=0),
+              help='Worker processes for parsing large catalogs, or for --matrix pairs '
+                   '(0 = one per CPU, default: 1, or one per CPU with --matrix)')
+@click.option('--matrix', help="Analyze several RHOAI:OCP pairs in parallel (e.g. '2.24:4.18,2.25:4.19' or 'all')")
+@click.option('--index', 'index_path',
+              help='SQLite digest index to record analyzed versions in (default: defaults.index_path in config)')
+@click.option('--mirror-size', is_flag=True,
+              help='Compute the layer-deduplicated mirror size from registry manifests')
+@click.pass_context
+def main(ctx: click.Context, rhoai_version: Optional[str], ocp_version: Optional[str], compare_with: Optional[str],
+         output_format: str, output_file: Optional[str], config_path: str, granular: bool, show_variants: bool,
+         use_cache: bool, snapshot_ref: Optional[str], source: Optional[str], jobs: Optional[int],
+         matrix: Optional[str], index_path: Optional[str], mirror_size: bool):
     """RHOAI Container Image Reporter - Generate reports for RHOAI/OCP version combinations."""
 
+    ctx.obj = {'config_path': config_path, 'index_path': index_path, 'output_format': output_format,
+               'output_file': output_file, 'use_cache': use_cache, 'snapshot_ref': snapshot_ref,
+               'source': source, 'jobs': jobs}
+    if ctx.invoked_subcommand:
+        return
+    if matrix and compare_with:
+        raise click.UsageError("--compare-with cannot be combined with --matrix")
+
     console.print("[bold blue]RHOAI Container Image Reporter[/bold blue]")
 
+    reporter = None
     try:
-        reporter = RHOAIReporter(config_path)
+        reporter = RHOAIReporter(config_path, use_cache=use_cache, snapshot_ref=snapshot_ref, source=source,
+                                 jobs=jobs, index_path=index_path, mirror_size=mirror_size)
+        if matrix:
+            reporter.generate_matrix_report(matrix, output_format=output_format, output_file=output_file)
+            return
         reporter.generate_report(
             rhoai_version=rhoai_version,
             ocp_version=ocp_version,
@@ -228,6 +580,133 @@ def main(rhoai_version: Optional[str], ocp_version: Optional[str], compare_with:
     except Exception as e:
         console.print(f"[red]Unexpected error: {e}[/red]")
         sys.exit(1)
+    finally:
+        if reporter:
+            reporter.close()
+
+
+@main.group('index')
+def index_command():
+    """Query the digest index of previously analyzed versions."""
+
+
+def _open_index(ctx: click.Context) -> DigestIndex:
+    """Open the digest index selected by --index or defaults.index_path."""
+    index_path = ctx.obj['index_path']
+    if not index_path:
+        defaults = RHOAIReporter._load_config(ctx.obj['config_path']).get('defaults') or {}
+        index_path = defaults.get('index_path')
+    if not index_path:
+        raise click.UsageError("No digest index configured; pass --index or set defaults.index_path")
+    if not os.path.exists(os.path.expanduser(index_path)):
+        raise click.UsageError(f"Digest index {index_path} does not exist yet; run a report with --index first")
+    return DigestIndex(index_path)
+
+
+def _print_rows(ctx: click.Context, rows: List[dict], columns: List[Tuple[str, str]], title: str) -> None:
+    """Print query results as a table, or as JSON with --format json."""
+    if ctx.obj['output_format'] == 'json':
+        click.echo(json.dumps(rows, indent=2))
+        return
+    table = Table(title=title)
+    for _, label in columns:
+        table.add_column(label)
+    for row in rows:
+        table.add_row(*[_format_cell(row[key]) for key, _ in columns])
+    console.print(table)
+
+
+def _format_cell(value) -> str:
+    """Render a query result value for a table cell."""
+    if isinstance(value, bool):
+        return "yes" if value else ""
+    if isinstance(value, list):
+        return "\n".join(value)
+    return str(value or "")
+
+
+@index_command.command('versions')
+@click.pass_context
+def index_versions(ctx: click.Context):
+    """List the indexed RHOAI/OCP versions."""
+    with _open_index(ctx) as digest_index:
+        rows = digest_index.versions()
+    _print_rows(ctx, rows, [('rhoai_version', 'RHOAI'), ('ocp_version', 'OCP'), ('images', 'Images'),
+                            ('unique_digests', 'Unique Digests')], "Indexed versions")
+
+
+@index_command.command('digest')
+@click.argument('digest')
+@click.pass_context
+def index_digest(ctx: click.Context, digest: str):
+    """Show which versions contain DIGEST."""
+    with _open_index(ctx) as digest_index:
+        rows = digest_index.find_digest(digest)
+    if not rows and ctx.obj['output_format'] != 'json':
+        console.print(f"[yellow]Digest {digest} is not in any indexed version[/yellow]")
+        return
+    _print_rows(ctx, rows, [('rhoai_version', 'RHOAI'), ('ocp_version', 'OCP'), ('component', 'Component'),
+                       ('source', 'Source'), ('full_reference', 'Reference')],
+                f"Versions containing {digest}")
+
+
+@index_command.command('repository')
+@click.argument('repository')
+@click.pass_context
+def index_repository(ctx: click.Context, repository: str):
+    """Show the digests of REPOSITORY per version and when they last changed."""
+    with _open_index(ctx) as digest_index:
+        rows = digest_index.repository_history(repository)
+    if not rows and ctx.obj['output_format'] != 'json':
+        console.print(f"[yellow]Repository {repository} is not in any indexed version[/yellow]")
+        return
+    _print_rows(ctx, rows, [('rhoai_version', 'RHOAI'), ('ocp_version', 'OCP'), ('changed', 'Changed'),
+                       ('digests', 'Digests')], f"History of {repository}")
+    changed = [row['rhoai_version'] for row in rows if row['changed']]
+    if ctx.obj['output_format'] != 'json':
+        console.print(f"Last changed in RHOAI {changed[-1]}" if changed else "Unchanged across indexed versions")
+
+
+@main.command('mirror-plan')
+@click.argument('versions', nargs=-1, required=True)
+@click.option('--existing', 'existing_path', type=click.Path(exists=True, dir_okay=False),
+              help='Already-mirrored images: a reference list or an ImageSetConfiguration')
+@click.option('--image-set-config', help='Write the images to mirror as an oc-mirror ImageSetConfiguration')
+@click.option('--list', 'list_file', help='Write the images to mirror as a plain list, one per line')
+@click.pass_context
+def mirror_plan_command(ctx: click.Context, versions: Tuple[str, ...], existing_path: Optional[str],
+                        image_set_config: Optional[str], list_file: Optional[str]):
+    """Plan a minimal mirror for VERSIONS (RHOAI:OCP, RHOAI for its newest OCP, or 'all').
+
+    Versions are planned in the order given; each one lists only the images
+    that neither the existing mirror set nor an earlier version holds.
+    """
+    options = ctx.obj
+    reporter = None
+    try:
+        reporter = RHOAIReporter(options['config_path'], use_cache=options['use_cache'],
+                                 snapshot_ref=options['snapshot_ref'], source=options['source'],
+                                 jobs=options['jobs'])
+        reporter.generate_mirror_plan(
+            ",".join(versions),
+            existing_path=existing_path,
+            image_set_config=image_set_config,
+            list_file=list_file,
+            output_format=options['output_format'],
+            output_file=options['output_file']
+        )
+    except RHOAIReporterError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Interrupted by user[/yellow]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Unexpected error: {e}[/red]")
+        sys.exit(1)
+    finally:
+        if reporter:
+            reporter.close()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,75 @@
 """Image analysis and classification engine."""
 
+import hashlib
+import json
 import re
-from collections import defaultdict
-from typing import Dict, List
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional
 
+from cache import ClassificationCache
+from exceptions import RHOAIReporterError
+from matching import RuleMatcher
 from models import (
-    Analysis, ComponentInfo, ImageClassification, ImageReference, ImageVariant,
-    RegistryAnalysis, SecurityInsights, VersionComparison
+    Analysis, ComponentInfo, ImageClassification, ImageReference,
+    ImageUpdate, ImageVariant, RegistryAnalysis, SecurityInsights, VersionComparison
 )
 
+# Python version markers in image names, first match wins
+PYTHON_VERSION_MATCHER = RuleMatcher([
+    (r'py311', '3.11'),
+    (r'py312', '3.12'),
+    (r'py310', '3.10'),
+    (r'py39', '3.9'),
+    (r'python3\.11', '3.11'),
+    (r'python3\.12', '3.12'),
+    (r'python3\.10', '3.10'),
+    (r'python-3\.11', '3.11'),
+    (r'python-3\.12', '3.12'),
+])
+# Bump when the hard-coded heuristics below or in the per-image helpers change,
+# so persisted classification memos are invalidated
+ANALYSIS_RULES_VERSION = 1
+
+# Repository name markers of deprecated images
+DEPRECATED_MARKERS = ['deprecated', 'legacy', 'old']
+
+CUDA_VERSION_RE = re.compile(r'cuda[-_]?(\d+)\.?(\d+)?')
+ROCM_VERSION_RE = re.compile(r'rocm[-_]?(\d+)\.?(\d+)?')
+
+# Characters that can follow the '@' of a digest reference such as @sha256:<hex>
+DIGEST_CHARS = frozenset('0123456789abcdefsh:')
+# Literal runs, optionally anchored and followed by a (?!.*literal) lookahead
+NAME_RULE_RE = re.compile(r'\^?([\w\-/@]+(?:\.\*[\w\-/@]+)*)(\$?)(?:\(\?!\.\*([\w\-/]+)\))?')
+
+
+def _within_name(pattern: str) -> bool:
+    """Check that a component rule's result on a digest reference never depends on the digest.
+
+    Holds when every literal run holds a character a digest cannot contain and
+    only the last run may end with the '@' before the digest, so all matches
+    end at or before it. Anything else is conservatively reported as False.
+    """
+    match = NAME_RULE_RE.fullmatch(pattern)
+    if match is None:
+        return False
+    runs, anchored_end, lookahead = match.groups()
+    runs = runs.split('.*')
+    if lookahead is not None:
+        runs.append(lookahead)
+    for position, run in enumerate(runs):
+        name = run[:-1] if run.endswith('@') and position == len(runs) - 1 and not anchored_end else run
+        if '@' in name or not set(name) - DIGEST_CHARS:
+            return False
+    return True
+
 
 class ImageAnalyzer:
     """Analyzes and classifies container images."""
 
-    def __init__(self):
+    def __init__(self, classification_cache: Optional[ClassificationCache] = None):
+        # Optional memo of per-repository results, reused across versions and runs
+        self.classification_cache = classification_cache
+
         # Infrastructure image patterns
         self.infrastructure_patterns = [
             r'.*-operator.*',
@@ -86,8 +142,60 @@ class ImageAnalyzer:
             'cuda_runtimes': [r'cuda(?!.*notebook)'],        # CUDA but not notebooks
         }
 
-    def analyze_images(self, images: List[ImageReference], rhoai_version: str, ocp_version: str) -> Analysis:
-        """Perform complete analysis of images."""
+        self._rules_signature = None
+        self._rules: Dict[str, RuleMatcher] = {}
+        self._ruleset_hash = ''
+        self._digest_free_memo = False
+
+    def ruleset_hash(self) -> str:
+        """Hash of every rule the per-image results depend on."""
+        self._matchers()
+        return self._ruleset_hash
+
+    def _matchers(self) -> Dict[str, RuleMatcher]:
+        """Get the compiled rule families, recompiling if the rules were changed."""
+        signature = (
+            tuple(self.infrastructure_patterns),
+            tuple(self.workload_patterns),
+            tuple((component_type, tuple(patterns))
+                  for component_type, patterns in self.component_patterns.items()),
+            tuple(self.trusted_registries),
+        )
+        if signature != self._rules_signature:
+            ruleset = [
+                ANALYSIS_RULES_VERSION, signature, PYTHON_VERSION_MATCHER.rules, DEPRECATED_MARKERS,
+                CUDA_VERSION_RE.pattern, ROCM_VERSION_RE.pattern,
+            ]
+            self._ruleset_hash = hashlib.sha256(json.dumps(ruleset).encode('utf-8')).hexdigest()
+            self._rules = {
+                'infrastructure': RuleMatcher.from_patterns(self.infrastructure_patterns, anchored=True),
+                'workload': RuleMatcher.from_patterns(self.workload_patterns, anchored=True),
+                'components': RuleMatcher(
+                    (pattern, component_type)
+                    for component_type, patterns in self.component_patterns.items()
+                    for pattern in patterns
+                ),
+            }
+            # Component rules also see the full reference; digests may only be
+            # left out of memo keys when no rule can look past the repository
+            self._digest_free_memo = all(
+                _within_name(pattern)
+                for patterns in self.component_patterns.values()
+                for pattern in patterns
+            )
+            self._rules_signature = signature
+        return self._rules
+
+    def analyze_images(self, images: List[ImageReference], rhoai_version: str, ocp_version: str,
+                       fused: bool = True) -> Analysis:
+        """Perform complete analysis of images.
+
+        The fused mode computes every attribute and aggregate in one loop;
+        ``fused=False`` runs the equivalent separate passes.
+        """
+        if fused:
+            return self._analyze_fused(images, rhoai_version, ocp_version)
+
         # Classify images
         self._classify_images(images)
 
@@ -118,156 +226,460 @@ class ImageAnalyzer:
             workload_images=workload_images,
             components=components,
             registry_analysis=registry_analysis,
-            security_insights=security_insights
+            security_insights=security_insights,
+            images=list(images)
+        )
+
+    def _analyze_fused(self, images: List[ImageReference], rhoai_version: str, ocp_version: str) -> Analysis:
+        """Compute every per-image attribute and aggregate in a single pass."""
+        matchers = self._matchers()
+        trusted_registries = self.trusted_registries
+        memo = self._memo()
+
+        # Per-image results depend only on identity, so they are resolved once per unique image
+        resolved: Dict[str, tuple] = {}
+
+        infrastructure_images = []
+        workload_images = []
+        component_groups = defaultdict(list)
+        registry_counts: Dict[str, int] = {}
+        namespace_counts: Dict[str, int] = {}
+        trusted_count = 0
+        community_count = 0
+        deprecated_images = []
+        unverified_sources = []
+
+        for image in images:
+            full_reference = image.full_reference
+            attributes = resolved.get(full_reference)
+            if attributes is None:
+                attributes = resolved[full_reference] = self._image_attributes(image, matchers, memo)
+            classification, component_type, deprecated = self._apply_attributes(image, attributes)
+
+            if classification == ImageClassification.INFRASTRUCTURE:
+                infrastructure_images.append(image)
+            elif classification == ImageClassification.WORKLOAD:
+                workload_images.append(image)
+
+            component_groups[component_type].append(image)
+
+            registry = image.registry
+            registry_counts[registry] = registry_counts.get(registry, 0) + 1
+            namespace_key = f"{registry}/{image.namespace}"
+            namespace_counts[namespace_key] = namespace_counts.get(namespace_key, 0) + 1
+
+            if registry in trusted_registries:
+                trusted_count += 1
+            else:
+                community_count += 1
+                if 'quay.io' not in registry:
+                    unverified_sources.append(full_reference)
+            if deprecated:
+                deprecated_images.append(full_reference)
+
+        if memo is not None:
+            self.classification_cache.save()
+
+        return Analysis(
+            rhoai_version=rhoai_version,
+            ocp_version=ocp_version,
+            total_images=len(images),
+            infrastructure_images=infrastructure_images,
+            workload_images=workload_images,
+            components=self._build_components(component_groups),
+            registry_analysis=RegistryAnalysis(
+                registry_counts=registry_counts,
+                namespace_counts=namespace_counts,
+                total_images=len(images)
+            ),
+            security_insights=self._security_insights(
+                trusted_count, community_count, deprecated_images, unverified_sources),
+            images=list(images)
+        )
+
+    def update_analysis(self, previous: Analysis, added_images: List[ImageReference],
+                        removed_digests: Iterable[str], rhoai_version: Optional[str] = None,
+                        ocp_version: Optional[str] = None) -> Analysis:
+        """Patch a previous analysis with added images and removed digests.
+
+        The result equals analyze_images() over the previous images without
+        the removed digests followed by the added images. Only the added and
+        removed images are classified, only the components they touch are
+        rebuilt, and counts and security findings are adjusted by delta.
+        The analyzer rules must be the ones the previous analysis used.
+        """
+        if previous.total_images and not previous.images:
+            raise RHOAIReporterError("Previous analysis does not carry its images; re-run analyze_images")
+
+        removed = set(removed_digests)
+        matchers = self._matchers()
+        trusted_registries = self.trusted_registries
+        memo = self._memo()
+        resolved: Dict[str, tuple] = {}
+
+        # Split the previous references into kept and removed, preserving order
+        kept_images = []
+        removed_images = []
+        if removed:
+            for image in previous.images:
+                (removed_images if image.digest in removed else kept_images).append(image)
+        else:
+            kept_images = list(previous.images)
+        removed_ids = {id(image) for image in removed_images}
+        images = kept_images + list(added_images)
+
+        # Component of each removed image, from the same rules that placed it
+        removed_by_component = defaultdict(set)
+        for image in removed_images:
+            attributes = resolved.get(image.full_reference)
+            if attributes is None:
+                attributes = resolved[image.full_reference] = self._image_attributes(image, matchers, memo)
+            removed_by_component[attributes[6]].add(id(image))
+
+        # Analyze only the added images
+        added_by_component = defaultdict(list)
+        added_infrastructure = []
+        added_workload = []
+        added_deprecated = []
+        for image in added_images:
+            attributes = resolved.get(image.full_reference)
+            if attributes is None:
+                attributes = resolved[image.full_reference] = self._image_attributes(image, matchers, memo)
+            classification, component_type, deprecated = self._apply_attributes(image, attributes)
+            if classification == ImageClassification.INFRASTRUCTURE:
+                added_infrastructure.append(image)
+            elif classification == ImageClassification.WORKLOAD:
+                added_workload.append(image)
+            added_by_component[component_type].append(image)
+            if deprecated:
+                added_deprecated.append(image.full_reference)
+
+        if memo is not None:
+            self.classification_cache.save()
+
+        # Rebuild only the touched components; order follows first appearance
+        components = []
+        reorder = False
+        for component in previous.components:
+            gone = removed_by_component.get(component.category)
+            extra = added_by_component.pop(component.category, None)
+            if not gone and not extra:
+                components.append(component)
+                continue
+            img_list = [img for img in component.images if id(img) not in gone] if gone else list(component.images)
+            # Removing a component's first reference can move it in first-appearance order
+            if gone and (img_list[:1] or extra) and (not img_list or img_list[0] is not component.images[0]):
+                reorder = True
+            if extra:
+                img_list.extend(extra)
+            if img_list:
+                components.append(self._build_component(component.category, img_list))
+        for component_type, img_list in added_by_component.items():
+            components.append(self._build_component(component_type, img_list))
+        if reorder:
+            positions = self._first_positions(images, [component.images[0] for component in components])
+            components.sort(key=lambda component: positions[id(component.images[0])])
+
+        # Adjust registry and namespace counts by delta
+        def registry_key(image):
+            return image.registry
+
+        def namespace_key(image):
+            return f"{image.registry}/{image.namespace}"
+
+        registry_counts = dict(previous.registry_analysis.registry_counts)
+        namespace_counts = dict(previous.registry_analysis.namespace_counts)
+        for image in removed_images:
+            registry_counts[registry_key(image)] -= 1
+            namespace_counts[namespace_key(image)] -= 1
+        registry_counts = {key: count for key, count in registry_counts.items() if count}
+        namespace_counts = {key: count for key, count in namespace_counts.items() if count}
+        for counts, key in ((registry_counts, registry_key), (namespace_counts, namespace_key)):
+            if self._first_reference_removed(previous.images, removed_images, removed_ids, counts, key):
+                order = dict.fromkeys(key(image) for image in kept_images)
+                reordered = {name: counts[name] for name in order}
+                counts.clear()
+                counts.update(reordered)
+        for image in added_images:
+            for counts, key in ((registry_counts, registry_key), (namespace_counts, namespace_key)):
+                name = key(image)
+                counts[name] = counts.get(name, 0) + 1
+
+        # Adjust security findings by delta
+        insights = previous.security_insights
+        trusted_count = insights.trusted_registries
+        community_count = insights.community_registries
+        deprecated_images = list(insights.deprecated_images)
+        unverified_sources = list(insights.unverified_sources)
+        if removed_images:
+            removed_references = {image.full_reference for image in removed_images}
+            deprecated_images = [ref for ref in deprecated_images if ref not in removed_references]
+            unverified_sources = [ref for ref in unverified_sources if ref not in removed_references]
+        for sign, delta_images in ((-1, removed_images), (1, added_images)):
+            for image in delta_images:
+                if image.registry in trusted_registries:
+                    trusted_count += sign
+                else:
+                    community_count += sign
+        deprecated_images.extend(added_deprecated)
+        unverified_sources.extend(
+            image.full_reference for image in added_images
+            if image.registry not in trusted_registries and 'quay.io' not in image.registry
         )
 
+        # Classification lists keep their order with the removed references filtered out
+        infrastructure_images = previous.infrastructure_images
+        workload_images = previous.workload_images
+        if removed_ids:
+            infrastructure_images = [img for img in infrastructure_images if id(img) not in removed_ids]
+            workload_images = [img for img in workload_images if id(img) not in removed_ids]
+
+        return Analysis(
+            rhoai_version=rhoai_version or previous.rhoai_version,
+            ocp_version=ocp_version or previous.ocp_version,
+            total_images=len(images),
+            infrastructure_images=infrastructure_images + added_infrastructure,
+            workload_images=workload_images + added_workload,
+            components=components,
+            registry_analysis=RegistryAnalysis(
+                registry_counts=registry_counts,
+                namespace_counts=namespace_counts,
+                total_images=len(images)
+            ),
+            security_insights=self._security_insights(
+                trusted_count, community_count, deprecated_images, unverified_sources),
+            images=images
+        )
+
+    @staticmethod
+    def _first_reference_removed(previous_images: List[ImageReference], removed_images: List[ImageReference],
+                                 removed_ids: set, surviving, key) -> bool:
+        """Check whether a surviving count key lost its first reference, which moves it in first-seen order.
+
+        The scan stops once the first reference of every touched key is seen.
+        """
+        pending = {key(image) for image in removed_images} & set(surviving)
+        for image in previous_images:
+            if not pending:
+                break
+            name = key(image)
+            if name in pending:
+                if id(image) in removed_ids:
+                    return True
+                pending.discard(name)
+        return False
+
+    @staticmethod
+    def _first_positions(images: List[ImageReference], wanted: List[ImageReference]) -> Dict[int, int]:
+        """Get the position of each wanted image (by identity) in an image list."""
+        pending = {id(image) for image in wanted}
+        positions = {}
+        for position, image in enumerate(images):
+            if id(image) in pending:
+                positions[id(image)] = position
+                pending.discard(id(image))
+                if not pending:
+                    break
+        return positions
+
+    def _memo(self) -> Optional[Dict[str, list]]:
+        """Get the classification memo for the active ruleset, if one is configured."""
+        if self.classification_cache is None:
+            return None
+        return self.classification_cache.entries(self.ruleset_hash())
+
+    @staticmethod
+    def _apply_attributes(image: ImageReference, attributes: tuple) -> tuple:
+        """Set derived attributes on an image; return its classification, component and deprecation."""
+        (classification, base_os, architecture, python_version, gpu_support, variant_type,
+         component_type, deprecated) = attributes
+        image.classification = classification
+        image.base_os = base_os
+        image.architecture = architecture
+        if python_version:
+            image.python_version = python_version
+        image.gpu_support = gpu_support
+        image.variant_type = variant_type
+        return classification, component_type, deprecated
+
+    def _image_attributes(self, image: ImageReference, matchers: Dict[str, RuleMatcher],
+                          memo: Optional[Dict[str, list]] = None) -> tuple:
+        """Derive (classification, base OS, variant fields, component, deprecated) for one image."""
+        if memo is not None:
+            key = self._memo_key(image)
+            cached = memo.get(key)
+            if cached is not None:
+                return (ImageClassification(cached[0]), *cached[1:])
+
+        image_name = image.repository_lower
+        attributes = (
+            self._classification_for(image_name, image.registry, matchers),
+            self._base_os_for(image_name),
+            *self._variants_for(image_name),
+            matchers['components'].first(image_name, image.full_reference_lower, default='other'),
+            any(pattern in image_name for pattern in DEPRECATED_MARKERS),
+        )
+
+        if memo is not None:
+            memo[key] = [attributes[0].value, *attributes[1:]]
+        return attributes
+
+    def _memo_key(self, image: ImageReference) -> str:
+        """Key an image by registry, repository and its lowercased reference.
+
+        The digest changes with every build, so it is left out of the
+        reference whenever no component rule can match past the repository,
+        letting results carry over between versions.
+        """
+        reference = image.full_reference_lower
+        digest = image.digest
+        if digest and self._digest_free_memo:
+            reference = reference[:len(reference) - len(digest)]
+        return f"{image.registry}\n{image.repository_lower}\n{reference}"
+
     def _classify_images(self, images: List[ImageReference]) -> None:
         """Classify images as infrastructure or workload."""
+        matchers = self._matchers()
         for image in images:
-            image_name = image.repository.lower()
-
-            # Check infrastructure patterns
-            if any(re.match(pattern, image_name) for pattern in self.infrastructure_patterns):
-                image.classification = ImageClassification.INFRASTRUCTURE
-            # Check workload patterns
-            elif any(re.match(pattern, image_name) for pattern in self.workload_patterns):
-                image.classification = ImageClassification.WORKLOAD
-            # Default classification based on registry and source
-            elif image.registry in self.trusted_registries:
-                image.classification = ImageClassification.INFRASTRUCTURE
-            else:
-                image.classification = ImageClassification.WORKLOAD
+            image.classification = self._classification_for(image.repository_lower, image.registry, matchers)
+
+    def _classification_for(self, image_name: str, registry: str,
+                            matchers: Dict[str, RuleMatcher]) -> ImageClassification:
+        """Classify one lowercased image name."""
+        # Check infrastructure patterns
+        if matchers['infrastructure'].matches(image_name):
+            return ImageClassification.INFRASTRUCTURE
+        # Check workload patterns
+        elif matchers['workload'].matches(image_name):
+            return ImageClassification.WORKLOAD
+        # Default classification based on registry and source
+        elif registry in self.trusted_registries:
+            return ImageClassification.INFRASTRUCTURE
+        else:
+            return ImageClassification.WORKLOAD
 
     def _detect_base_os(self, images: List[ImageReference]) -> None:
         """Detect base OS from image names."""
         for image in images:
-            image_name = image.repository.lower()
-            if '-rhel8' in image_name or 'rhel8' in image_name:
-                image.base_os = 'RHEL8'
-            elif '-rhel9' in image_name or 'rhel9' in image_name:
-                image.base_os = 'RHEL9'
-            elif '-ubi8' in image_name or 'ubi8' in image_name:
-                image.base_os = 'UBI8'
-            elif '-ubi9' in image_name or 'ubi9' in image_name:
-                image.base_os = 'UBI9'
-            elif '-ubi' in image_name or 'ubi' in image_name:
-                image.base_os = 'UBI'
-            else:
-                image.base_os = 'Unknown'
+            image.base_os = self._base_os_for(image.repository_lower)
+
+    @staticmethod
+    def _base_os_for(image_name: str) -> str:
+        """Detect the base OS of one lowercased image name."""
+        if '-rhel8' in image_name or 'rhel8' in image_name:
+            return 'RHEL8'
+        elif '-rhel9' in image_name or 'rhel9' in image_name:
+            return 'RHEL9'
+        elif '-ubi8' in image_name or 'ubi8' in image_name:
+            return 'UBI8'
+        elif '-ubi9' in image_name or 'ubi9' in image_name:
+            return 'UBI9'
+        elif '-ubi' in image_name or 'ubi' in image_name:
+            return 'UBI'
+        else:
+            return 'Unknown'
 
     def _detect_variants(self, images: List[ImageReference]) -> None:
         """Detect image variants (architecture, Python version, GPU support, etc.)."""
         for image in images:
-            image_name = image.repository.lower()
-            full_name = image.full_reference.lower()
-
-            # Detect architecture
-            if 'amd64' in image_name or 'x86_64' in image_name:
-                image.architecture = 'amd64'
-            elif 'arm64' in image_name or 'aarch64' in image_name:
-                image.architecture = 'arm64'
-            elif 'cuda' in image_name or 'rocm' in image_name:
-                image.architecture = 'amd64'  # GPU variants are typically x86_64
+            architecture, python_version, gpu_support, variant_type = self._variants_for(image.repository_lower)
+            image.architecture = architecture
+            if python_version:
+                image.python_version = python_version
+            image.gpu_support = gpu_support
+            image.variant_type = variant_type
+
+    @staticmethod
+    def _variants_for(image_name: str) -> tuple:
+        """Detect (architecture, Python version, GPU support, variant type) of one lowercased image name."""
+        # Detect architecture
+        if 'amd64' in image_name or 'x86_64' in image_name:
+            architecture = 'amd64'
+        elif 'arm64' in image_name or 'aarch64' in image_name:
+            architecture = 'arm64'
+        elif 'cuda' in image_name or 'rocm' in image_name:
+            architecture = 'amd64'  # GPU variants are typically x86_64
+        else:
+            architecture = 'amd64'  # Default assumption for most images
+
+        # Detect Python version
+        python_version = PYTHON_VERSION_MATCHER.first(image_name)
+
+        # Detect GPU support
+        if 'cuda' in image_name:
+            # Try to extract CUDA version
+            cuda_match = CUDA_VERSION_RE.search(image_name)
+            if cuda_match:
+                major = cuda_match.group(1)
+                minor = cuda_match.group(2) or '0'
+                gpu_support = f'CUDA {major}.{minor}'
             else:
-                image.architecture = 'amd64'  # Default assumption for most images
-
-            # Detect Python version
-            python_patterns = [
-                (r'py311', '3.11'),
-                (r'py312', '3.12'),
-                (r'py310', '3.10'),
-                (r'py39', '3.9'),
-                (r'python3\.11', '3.11'),
-                (r'python3\.12', '3.12'),
-                (r'python3\.10', '3.10'),
-                (r'python-3\.11', '3.11'),
-                (r'python-3\.12', '3.12'),
-            ]
-
-            for pattern, version in python_patterns:
-                if re.search(pattern, image_name):
-                    image.python_version = version
-                    break
-
-            # Detect GPU support
-            if 'cuda' in image_name:
-                # Try to extract CUDA version
-                cuda_match = re.search(r'cuda[-_]?(\d+)\.?(\d+)?', image_name)
-                if cuda_match:
-                    major = cuda_match.group(1)
-                    minor = cuda_match.group(2) or '0'
-                    image.gpu_support = f'CUDA {major}.{minor}'
-                else:
-                    image.gpu_support = 'CUDA'
-            elif 'rocm' in image_name:
-                # Try to extract ROCm version
-                rocm_match = re.search(r'rocm[-_]?(\d+)\.?(\d+)?', image_name)
-                if rocm_match:
-                    major = rocm_match.group(1)
-                    minor = rocm_match.group(2) or '0'
-                    image.gpu_support = f'ROCm {major}.{minor}'
-                else:
-                    image.gpu_support = 'ROCm'
-            elif 'gpu' in image_name:
-                image.gpu_support = 'GPU'
-            else:
-                image.gpu_support = 'CPU'
-
-            # Detect variant type
-            if 'workbench' in image_name:
-                image.variant_type = 'workbench'
-            elif 'pipeline' in image_name:
-                image.variant_type = 'pipeline'
-            elif 'notebook' in image_name:
-                image.variant_type = 'notebook'
-            elif 'runtime' in image_name:
-                image.variant_type = 'runtime'
-            elif 'serving' in image_name:
-                image.variant_type = 'serving'
+                gpu_support = 'CUDA'
+        elif 'rocm' in image_name:
+            # Try to extract ROCm version
+            rocm_match = ROCM_VERSION_RE.search(image_name)
+            if rocm_match:
+                major = rocm_match.group(1)
+                minor = rocm_match.group(2) or '0'
+                gpu_support = f'ROCm {major}.{minor}'
             else:
-                image.variant_type = 'base'
+                gpu_support = 'ROCm'
+        elif 'gpu' in image_name:
+            gpu_support = 'GPU'
+        else:
+            gpu_support = 'CPU'
+
+        # Detect variant type
+        if 'workbench' in image_name:
+            variant_type = 'workbench'
+        elif 'pipeline' in image_name:
+            variant_type = 'pipeline'
+        elif 'notebook' in image_name:
+            variant_type = 'notebook'
+        elif 'runtime' in image_name:
+            variant_type = 'runtime'
+        elif 'serving' in image_name:
+            variant_type = 'serving'
+        else:
+            variant_type = 'base'
+
+        return architecture, python_version, gpu_support, variant_type
 
     def _group_into_components(self, images: List[ImageReference]) -> List[ComponentInfo]:
         """Group images into functional components with enhanced granularity."""
-        components = []
         component_groups = defaultdict(list)
 
-        # Group images by component patterns with more precise matching
+        # Check patterns in order of specificity (most specific first)
+        # against both the repository and the full reference
+        match_component = self._matchers()['components'].first
         for image in images:
-            image_name = image.repository.lower()
-            full_image = image.full_reference.lower()
-            assigned = False
-
-            # Check patterns in order of specificity (most specific first)
-            for component_type, patterns in self.component_patterns.items():
-                for pattern in patterns:
-                    if re.search(pattern, image_name) or re.search(pattern, full_image):
-                        component_groups[component_type].append(image)
-                        assigned = True
-                        break
-                if assigned:
-                    break
+            component_type = match_component(image.repository_lower, image.full_reference_lower, default='other')
+            component_groups[component_type].append(image)
 
-            if not assigned:
-                component_groups['other'].append(image)
+        return self._build_components(component_groups)
 
-        # Create ComponentInfo objects with variant analysis
-        for component_type, img_list in component_groups.items():
-            if img_list:
-                variants = self._analyze_component_variants(img_list)
-                unique_digests = len(set(img.digest for img in img_list if img.digest))
-
-                components.append(ComponentInfo(
-                    name=self._get_component_display_name(component_type),
-                    images=img_list,
-                    category=component_type,
-                    description=self._get_component_description(component_type),
-                    unique_digests=unique_digests,
-                    total_references=len(img_list),
-                    variants=variants
-                ))
+    def _build_components(self, component_groups: Dict[str, List[ImageReference]]) -> List[ComponentInfo]:
+        """Create ComponentInfo objects with variant analysis from grouped images."""
+        return [
+            self._build_component(component_type, img_list)
+            for component_type, img_list in component_groups.items()
+            if img_list
+        ]
 
-        return components
+    def _build_component(self, component_type: str, img_list: List[ImageReference]) -> ComponentInfo:
+        """Create one ComponentInfo with variant analysis."""
+        variants = self._analyze_component_variants(img_list)
+        unique_digests = len(set(img.digest for img in img_list if img.digest))
+
+        return ComponentInfo(
+            name=self._get_component_display_name(component_type),
+            images=img_list,
+            category=component_type,
+            description=self._get_component_description(component_type),
+            unique_digests=unique_digests,
+            total_references=len(img_list),
+            variants=variants
+        )
 
     def _analyze_component_variants(self, images: List[ImageReference]) -> List[ImageVariant]:
         """Analyze variants within a component."""
@@ -414,7 +826,6 @@ class ImageAnalyzer:
         community_count = 0
         deprecated_images = []
         unverified_sources = []
-        recommendations = []
 
         for image in images:
             if image.registry in self.trusted_registries:
@@ -423,13 +834,20 @@ class ImageAnalyzer:
                 community_count += 1
 
             # Check for deprecated patterns
-            if any(pattern in image.repository.lower() for pattern in ['deprecated', 'legacy', 'old']):
+            if any(pattern in image.repository_lower for pattern in DEPRECATED_MARKERS):
                 deprecated_images.append(image.full_reference)
 
             # Check for potentially unverified sources
             if image.registry not in self.trusted_registries and 'quay.io' not in image.registry:
                 unverified_sources.append(image.full_reference)
 
+        return self._security_insights(trusted_count, community_count, deprecated_images, unverified_sources)
+
+    def _security_insights(self, trusted_count: int, community_count: int,
+                           deprecated_images: List[str], unverified_sources: List[str]) -> SecurityInsights:
+        """Build security insights and recommendations from the per-image findings."""
+        recommendations = []
+
         # Generate recommendations
         if deprecated_images:
             recommendations.append(f"Migrate {len(deprecated_images)} deprecated images before next release")
@@ -451,8 +869,8 @@ class ImageAnalyzer:
     def compare_versions(self, current_images: List[ImageReference],
                         previous_images: List[ImageReference]) -> VersionComparison:
         """Compare two sets of images to identify changes."""
-        current_digests = {img.digest: img for img in current_images if img.digest}
-        previous_digests = {img.digest: img for img in previous_images if img.digest}
+        current_digests = self._by_digest(current_images)
+        previous_digests = self._by_digest(previous_images)
 
         # Find added images
         added_images = [img for digest, img in current_digests.items()
@@ -466,13 +884,57 @@ class ImageAnalyzer:
         unchanged_images = [img for digest, img in current_digests.items()
                           if digest in previous_digests]
 
-        # For now, assume no updated images (same component, different digest)
-        # This would require more sophisticated component matching
-        updated_images = []
+        # Pair rebuilt images (same component, different digest) with a hash join
+        updated_images = self._match_updates(removed_images, added_images)
+        if updated_images:
+            updated_ids = {id(update.previous) for update in updated_images}
+            updated_ids.update(id(update.current) for update in updated_images)
+            added_images = [img for img in added_images if id(img) not in updated_ids]
+            removed_images = [img for img in removed_images if id(img) not in updated_ids]
 
         return VersionComparison(
             added_images=added_images,
             removed_images=removed_images,
             updated_images=updated_images,
             unchanged_images=unchanged_images
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _by_digest(images: List[ImageReference]) -> Dict[str, ImageReference]:
+        """Map each digest to one reference, preferring one that carries an OLM related image name.
+
+        Helper copies of a digest have no semantic name, so letting them win
+        would give the two sides of a comparison different update keys.
+        """
+        by_digest: Dict[str, ImageReference] = {}
+        for image in images:
+            if not image.digest:
+                continue
+            kept = by_digest.setdefault(image.digest, image)
+            if kept.semantic_name is None and image.semantic_name is not None:
+                by_digest[image.digest] = image
+        return by_digest
+
+    @staticmethod
+    def _update_key(image: ImageReference) -> tuple:
+        """Stable component key: the repository path plus the OLM related image name.
+
+        A bundle's semantic name is its version, which differs between any
+        two versions, so bundles are keyed on the repository path alone.
+        """
+        semantic_name = None if image.category == 'bundle' else image.semantic_name
+        return (f"{image.registry}/{image.namespace}/{image.repository}", semantic_name)
+
+    def _match_updates(self, removed_images: List[ImageReference],
+                       added_images: List[ImageReference]) -> List[ImageUpdate]:
+        """Pair removed and added images sharing a component key, in order of appearance."""
+        previous_by_key = defaultdict(deque)
+        for image in removed_images:
+            previous_by_key[self._update_key(image)].append(image)
+
+        updates = []
+        for image in added_images:
+            candidates = previous_by_key.get(self._update_key(image))
+            if candidates:
+                updates.append(ImageUpdate(previous=candidates.popleft(), current=image))
+        return updates
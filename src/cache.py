@@ -0,0 +1,374 @@
+"""Persistent on-disk caches for fetched RHOAI data."""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, IO, Iterable, List, Optional
+
+# Read size when hashing source streams for content keys
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _atomic_write(path: str, data) -> None:
+    """Write bytes, or an iterable of byte chunks, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@dataclass
+class CachedResponse:
+    """Cached HTTP response body and its validators."""
+    url: str
+    etag: Optional[str]
+    fetched_at: float
+    headers: Dict[str, str]
+    body_path: str
+
+    def is_fresh(self, max_age: int) -> bool:
+        """Check whether the entry can be served without revalidation."""
+        return time.time() - self.fetched_at < max_age
+
+    def read_body(self) -> bytes:
+        """Load the cached response body."""
+        with open(self.body_path, 'rb') as f:
+            return f.read()
+
+    def open_body(self) -> IO[bytes]:
+        """Open the cached response body for streaming reads."""
+        return open(self.body_path, 'rb')
+
+
+class ResponseCache:
+    """On-disk HTTP response cache keyed by URL and auth identity.
+
+    Each entry is stored as a JSON metadata file next to a raw body file.
+    Entries younger than ``max_age`` seconds are served directly; older
+    entries are revalidated with their ETag by the caller.
+    """
+
+    def __init__(self, cache_dir: str, max_age: int = 3600):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_age = max_age
+
+    def _paths(self, url: str, identity: str):
+        """Get metadata and body paths for a cache key."""
+        key = hashlib.sha256(f"{identity}\n{url}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, 'http', key[:2], key)
+        return base + '.json', base + '.body'
+
+    def get(self, url: str, identity: str) -> Optional[CachedResponse]:
+        """Look up a cached response, fresh or stale."""
+        meta_path, body_path = self._paths(url, identity)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('url') != url or not os.path.exists(body_path):
+            return None
+
+        return CachedResponse(
+            url=url,
+            etag=meta.get('etag'),
+            fetched_at=meta.get('fetched_at', 0),
+            headers=meta.get('headers', {}),
+            body_path=body_path
+        )
+
+    def store(self, url: str, identity: str, body: bytes,
+              etag: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """Store a response body and its validators."""
+        return self.store_stream(url, identity, [body], etag=etag, headers=headers)
+
+    def store_stream(self, url: str, identity: str, chunks: Iterable[bytes],
+                     etag: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """Store a response body from an iterable of chunks without buffering it."""
+        meta_path, body_path = self._paths(url, identity)
+        entry = CachedResponse(
+            url=url,
+            etag=etag,
+            fetched_at=time.time(),
+            headers=headers or {},
+            body_path=body_path
+        )
+        _atomic_write(body_path, chunks)
+        self._write_meta(meta_path, entry)
+        return entry
+
+    def touch(self, entry: CachedResponse, identity: str) -> None:
+        """Mark an entry as freshly revalidated."""
+        entry.fetched_at = time.time()
+        meta_path, _ = self._paths(entry.url, identity)
+        self._write_meta(meta_path, entry)
+
+    def _write_meta(self, meta_path: str, entry: CachedResponse) -> None:
+        """Persist entry metadata."""
+        meta = {
+            'url': entry.url,
+            'etag': entry.etag,
+            'fetched_at': entry.fetched_at,
+            'headers': entry.headers
+        }
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+
+class ResolutionCache:
+    """Persistent memo of resolved source paths, known-missing paths and lookups.
+
+    Values expire after ``ttl`` seconds. All entries live in one small JSON
+    file. Updates are kept in memory and written by ``flush`` or ``close``
+    in a single atomic replace, merged into whatever other runs wrote since
+    the file was loaded.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int = 3600, scope: str = 'default'):
+        self.path = os.path.join(os.path.expanduser(cache_dir), 'resolutions.json')
+        self.ttl = ttl
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        # Entries set (or discarded, as None) since the last flush
+        self._changes: Dict[str, Optional[Dict]] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load all entries from disk, ignoring an unreadable file."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _key(self, key: str) -> str:
+        """Qualify a key with this memo's scope."""
+        return f"{self.scope}|{key}"
+
+    def get(self, key: str):
+        """Get an unexpired value, or None."""
+        with self._lock:
+            entry = self._entries.get(self._key(key))
+        if not entry or entry.get('expires', 0) < time.time():
+            return None
+        return entry.get('value')
+
+    def set(self, key: str, value) -> None:
+        """Store a JSON-serializable value until the next flush."""
+        entry = {'value': value, 'expires': time.time() + self.ttl}
+        with self._lock:
+            self._entries[self._key(key)] = self._changes[self._key(key)] = entry
+
+    def discard(self, key: str) -> None:
+        """Forget a value, e.g. a resolved path that no longer exists."""
+        with self._lock:
+            if self._entries.pop(self._key(key), None) is not None:
+                self._changes[self._key(key)] = None
+
+    def flush(self) -> None:
+        """Merge pending changes into the file on disk and write unexpired entries back."""
+        with self._lock:
+            if not self._changes:
+                return
+            entries = self._load()
+            for key, entry in self._changes.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            now = time.time()
+            self._entries = {k: v for k, v in entries.items()
+                             if isinstance(v, dict) and v.get('expires', 0) >= now}
+            self._changes = {}
+            _atomic_write(self.path, json.dumps(self._entries, sort_keys=True).encode('utf-8'))
+
+    def close(self) -> None:
+        """Persist pending changes."""
+        self.flush()
+
+
+class ParsedCache:
+    """Content-addressed cache of parser results.
+
+    Parsing is pure, so results are keyed by a hash of the source bytes.
+    Records are stored as zlib-compressed marshal data, and the least
+    recently used entries are evicted once the cache exceeds ``max_bytes``.
+    """
+
+    # Bump when the record layout changes; marshal data is also Python-version specific
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), 'parsed')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_key(content) -> Optional[str]:
+        """SHA-256 of source content given as text, bytes or a seekable binary stream.
+
+        Streams are hashed in chunks and rewound; non-seekable streams have no key.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if isinstance(content, (bytes, bytearray)):
+            return hashlib.sha256(content).hexdigest()
+        if not getattr(content, 'seekable', lambda: False)():
+            return None
+
+        digest = hashlib.sha256()
+        start = content.tell()
+        for chunk in iter(lambda: content.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        content.seek(start)
+        return digest.hexdigest()
+
+    def _path(self, kind: str, key: str) -> str:
+        """Path of the entry for a parser kind and content key."""
+        version = f"v{self.FORMAT_VERSION}-py{sys.version_info[0]}{sys.version_info[1]}"
+        return os.path.join(self.cache_dir, f"{kind}-{version}-{key}.bin")
+
+    def get(self, kind: str, key: str) -> Optional[List[tuple]]:
+        """Load cached records, or None on a miss."""
+        path = self._path(kind, key)
+        try:
+            with open(path, 'rb') as f:
+                records = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            return None
+        # Refresh the modification time, which orders eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return records
+
+    def put(self, kind: str, key: str, records: List[tuple]) -> None:
+        """Store records and evict old entries beyond the size limit."""
+        data = zlib.compress(marshal.dumps(records), 6)
+        _atomic_write(self._path(kind, key), data)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        # The lock only covers this process; worker processes may evict concurrently
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                scan = list(os.scandir(self.cache_dir))
+            except OSError:
+                return
+            for entry in scan:
+                try:
+                    if not (entry.is_file() and entry.name.endswith('.bin')):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+
+
+class ClassificationCache:
+    """Memo of per-repository analysis results for one analyzer ruleset.
+
+    Entries map an image key, digest-free where the rules allow, to the
+    attributes the analyzer derived for it. They are only valid for the ruleset they were computed
+    under, so loading under a different ruleset hash starts empty. Without
+    ``cache_dir`` the memo lives in memory only.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.path = (os.path.join(os.path.expanduser(cache_dir), 'classifications.json')
+                     if cache_dir else None)
+        self.ruleset: Optional[str] = None
+        self._entries: Dict[str, list] = {}
+        self._saved_count = 0
+
+    def entries(self, ruleset: str) -> Dict[str, list]:
+        """Get the mutable entry mapping for a ruleset, loading it on first use."""
+        if ruleset != self.ruleset:
+            self.ruleset = ruleset
+            self._entries = self._load(ruleset)
+            self._saved_count = len(self._entries)
+        return self._entries
+
+    def _load(self, ruleset: str) -> Dict[str, list]:
+        """Load persisted entries if they were computed under this ruleset."""
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('ruleset') != ruleset:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+
+    def save(self) -> None:
+        """Persist the entries if any were added since the last load or save."""
+        if not self.path or self.ruleset is None or len(self._entries) == self._saved_count:
+            return
+        data = {'ruleset': self.ruleset, 'entries': self._entries}
+        _atomic_write(self.path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        self._saved_count = len(self._entries)
+
+
+class ManifestCache:
+    """Persistent cache of image manifests keyed by their digest.
+
+    Manifests are content-addressed and immutable, so entries never expire.
+    Each one is stored as the raw manifest bytes, which the caller verifies
+    against the digest.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), 'manifests')
+
+    def _path(self, digest: str) -> str:
+        """Path of the entry for a digest such as sha256:abc..."""
+        return os.path.join(self.cache_dir, digest.replace(':', '-') + '.json')
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Load a cached manifest, or None on a miss."""
+        try:
+            with open(self._path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, digest: str, manifest: bytes) -> None:
+        """Store the raw bytes of a manifest."""
+        _atomic_write(self._path(digest), manifest)
@@ -0,0 +1,116 @@
+"""Multi-version analysis engine running parse and analysis in worker processes."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analyzer import ImageAnalyzer
+from cache import ClassificationCache, ParsedCache
+from exceptions import VersionNotFoundError
+from models import Analysis, MatrixResult
+from parsers import DisconnectedHelperParser, OLMCatalogParser, process_pool_context
+from sources import SourceBackend
+
+# Parsers and analyzer of a worker process, reused for every pair it handles
+_worker_state = None
+
+
+def _init_worker(cache_dir: Optional[str], parsed_cache_max_bytes: int) -> None:
+    """Create the parsers and analyzer of a worker process."""
+    global _worker_state
+    parsed_cache = ParsedCache(cache_dir, max_bytes=parsed_cache_max_bytes) if cache_dir else None
+    _worker_state = (
+        OLMCatalogParser(cache=parsed_cache),
+        DisconnectedHelperParser(cache=parsed_cache),
+        ImageAnalyzer(ClassificationCache(cache_dir)),
+    )
+
+
+def _analyze_pair(rhoai_version: str, ocp_version: str, olm_source: Tuple[bytes, Optional[str]],
+                  helper_source: Tuple[bytes, Optional[str]]) -> Analysis:
+    """Parse and analyze the (content, blob SHA) sources of one pair in a worker process."""
+    olm_parser, helper_parser, analyzer = _worker_state
+    images = olm_parser.parse_catalog(olm_source[0], content_key=olm_source[1])
+    if helper_source[0]:
+        images += helper_parser.parse_markdown(helper_source[0], content_key=helper_source[1])
+    if not images:
+        raise VersionNotFoundError(f"No images found for RHOAI {rhoai_version} / OCP {ocp_version}")
+    return analyzer.analyze_images(images, rhoai_version, ocp_version)
+
+
+class AnalysisEngine:
+    """Analyzes a matrix of RHOAI/OCP pairs.
+
+    Sources are fetched in this process on a thread pool through one source
+    backend, so every pair shares its HTTP cache, snapshot and rate limiter.
+    Each pair is handed to a worker process for parsing and analysis as soon
+    as its sources arrive, so the matrix takes about as long as its slowest
+    pair rather than the sum of all of them.
+    """
+
+    def __init__(self, source: SourceBackend, workers: int = 0, fetch_workers: int = 8,
+                 cache_dir: Optional[str] = None, parsed_cache_max_bytes: int = 256 * 1024 * 1024):
+        self.source = source
+        self.workers = workers or os.cpu_count() or 1
+        self.fetch_workers = fetch_workers
+        self.cache_dir = cache_dir
+        self.parsed_cache_max_bytes = parsed_cache_max_bytes
+
+    def run(self, pairs: Iterable[Tuple[str, str]]) -> List[MatrixResult]:
+        """Analyze every pair, returning one result per pair in the given order."""
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return []
+
+        results: Dict[Tuple[str, str], MatrixResult] = {
+            pair: MatrixResult(rhoai_version=pair[0], ocp_version=pair[1]) for pair in pairs
+        }
+
+        # Workers are not forked from this process while its fetch threads may hold locks
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetcher, \
+                ProcessPoolExecutor(max_workers=min(self.workers, len(pairs)), initializer=_init_worker,
+                                    initargs=(self.cache_dir, self.parsed_cache_max_bytes),
+                                    mp_context=process_pool_context()) as pool:
+            # Helper lists depend only on the RHOAI version, so each is fetched once
+            helper_futures = {
+                rhoai_version: fetcher.submit(self._read, self.source.open_disconnected_helper, rhoai_version)
+                for rhoai_version in dict.fromkeys(rhoai for rhoai, _ in pairs)
+            }
+            olm_futures = {
+                fetcher.submit(self._read, self.source.open_olm_catalog, rhoai_version, ocp_version):
+                    (rhoai_version, ocp_version)
+                for rhoai_version, ocp_version in pairs
+            }
+
+            analysis_futures = {}
+            for future in as_completed(olm_futures):
+                pair = olm_futures[future]
+                result = results[pair]
+                try:
+                    olm_source = future.result()
+                except Exception as e:
+                    result.error = f"Error fetching OLM catalog: {e}"
+                    continue
+
+                try:
+                    helper_source = helper_futures[pair[0]].result()
+                except Exception as e:
+                    result.warnings.append(f"Could not fetch disconnected helper data: {e}")
+                    helper_source = (b"", None)
+
+                analysis_futures[pool.submit(_analyze_pair, *pair, olm_source, helper_source)] = pair
+
+            for future in as_completed(analysis_futures):
+                result = results[analysis_futures[future]]
+                try:
+                    result.analysis = future.result()
+                except Exception as e:
+                    result.error = f"Error analyzing images: {e}"
+
+        return [results[pair] for pair in pairs]
+
+    @staticmethod
+    def _read(open_source, *args) -> Tuple[bytes, Optional[str]]:
+        """Read a source file as bytes, which workers parse without decoding, plus its blob SHA."""
+        with open_source(*args) as source_file:
+            return source_file.stream.read(), source_file.blob_sha
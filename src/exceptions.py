@@ -18,4 +18,8 @@ class DataParsingError(RHOAIReporterError):
 
 class GitHubAPIError(RHOAIReporterError):
     """GitHub API request failed."""
-    pass
\ No newline at end of file
+    pass
+
+class RegistryError(RHOAIReporterError):
+    """Container registry request failed."""
+    pass
@@ -1,142 +1,281 @@
 """GitHub API client for fetching RHOAI data sources."""
 
+import hashlib
 import os
-import re
-import time
-from typing import Dict, List, Optional, Tuple
+import shutil
+import tempfile
+from typing import Dict, IO, List, Optional
 from urllib.parse import quote
 
 import requests
+from requests.structures import CaseInsensitiveDict
 
+from cache import CachedResponse, ResponseCache
 from exceptions import GitHubAPIError, VersionNotFoundError
+from rate_limit import RequestScheduler
+from snapshot import RepositorySnapshot
+
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+STREAM_CHUNK_SIZE = 256 * 1024
+# Uncached bodies larger than this are spooled to a temporary file instead of memory
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
 
 
 class GitHubAPIClient:
     """Client for accessing GitHub repositories via API."""
 
-    def __init__(self, token: Optional[str] = None):
-        self.token = token or os.getenv('GITHUB_TOKEN')
+    # Cached snapshots kept per repository; older commits are pruned
+    max_cached_snapshots = 3
+
+    def __init__(self, token: Optional[str] = None, cache_dir: Optional[str] = None,
+                 cache_duration: int = 3600, tokens: Optional[List[str]] = None,
+                 requests_per_second: float = 10.0, max_retries: int = 5, timeout: float = 30):
+        # A pool of tokens is rotated by the scheduler; GITHUB_TOKENS is comma-separated
+        env_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        self.tokens = tokens or env_tokens
+        self.token = token or (self.tokens[0] if self.tokens else os.getenv('GITHUB_TOKEN'))
+        if self.token and self.token not in self.tokens:
+            self.tokens = [self.token] + self.tokens
         self.session = requests.Session()
-        if self.token:
-            self.session.headers.update({'Authorization': f'token {self.token}'})
+        # Seconds to wait for a connection or between bytes of a response
+        self.timeout = timeout
 
         self.base_url = "https://api.github.com"
-        self._rate_limit_remaining = 5000
-        self._rate_limit_reset = 0
+        # Rate-limit state is shared by all threads using this client
+        self.scheduler = RequestScheduler(
+            self.tokens or None,
+            requests_per_second=requests_per_second,
+            max_retries=max_retries
+        )
+
+        # Optional persistent response cache, revalidated with ETags
+        self.cache = ResponseCache(cache_dir, cache_duration) if cache_dir else None
+
+        # Local repository snapshots used for bulk reads, keyed by repo
+        self.snapshots: Dict[str, RepositorySnapshot] = {}
+        # Extraction directories of uncached snapshots, removed by close()
+        self._temp_dirs: List[tempfile.TemporaryDirectory] = []
+
+    def close(self) -> None:
+        """Remove uncached snapshot directories and close the HTTP session."""
+        for temp_dir in self._temp_dirs:
+            temp_dir.cleanup()
+        self._temp_dirs = []
+        self.session.close()
+
+    @property
+    def _auth_identity(self) -> str:
+        """Identify the credentials used, without exposing the tokens."""
+        if not self.tokens:
+            return 'anonymous'
+        joined = '\n'.join(sorted(self.tokens))
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()[:16]
+
+    def request_stats(self) -> Dict[str, float]:
+        """Get counters for requests, retries and rate-limit waits so far."""
+        return self.scheduler.stats.to_dict()
 
     def _make_request(self, url: str) -> requests.Response:
-        """Make GitHub API request with rate limiting."""
-        # Check rate limit
-        if self._rate_limit_remaining <= 10 and time.time() < self._rate_limit_reset:
-            sleep_time = self._rate_limit_reset - time.time() + 1
-            time.sleep(sleep_time)
+        """Make GitHub API request with rate limiting and response caching."""
+        cached = self.cache.get(url, self._auth_identity) if self.cache else None
+        if cached and cached.is_fresh(self.cache.max_age):
+            return self._cached_response(cached)
 
-        response = self.session.get(url)
+        # Revalidate stale entries; 304 responses do not count against the rate limit
+        request_headers = {}
+        if cached and cached.etag:
+            request_headers['If-None-Match'] = cached.etag
 
-        # Update rate limit info
-        self._rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 5000))
-        self._rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', time.time() + 3600))
+        response = self._send(url, headers=request_headers)
 
-        if response.status_code == 404:
+        if response.status_code == 304 and cached:
+            self.cache.touch(cached, self._auth_identity)
+            return self._cached_response(cached)
+        elif response.status_code == 404:
             raise VersionNotFoundError(f"Resource not found: {url}")
         elif response.status_code != 200:
             raise GitHubAPIError(f"GitHub API error {response.status_code}: {response.text}")
 
+        if self.cache:
+            self.cache.store(
+                url, self._auth_identity, response.content,
+                etag=response.headers.get('ETag'),
+                headers={'Content-Type': response.headers.get('Content-Type', '')}
+            )
+
+        return response
+
+    def _send(self, url: str, headers: Optional[Dict[str, str]] = None,
+              stream: bool = False) -> requests.Response:
+        """Send a GET request through the rate-limit-aware scheduler."""
+        return self.scheduler.send(self.session, url, headers=headers, stream=stream, timeout=self.timeout)
+
+    def _cached_response(self, cached: CachedResponse) -> requests.Response:
+        """Build a response object from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = cached.url
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response.encoding = 'utf-8'
+        response._content = cached.read_body()
         return response
 
+    def snapshot_repository(self, repo: str, prefixes: List[str], ref: str = 'HEAD') -> RepositorySnapshot:
+        """Snapshot subtrees of a repository at a pinned commit.
+
+        Costs one commit lookup, one recursive tree listing and one tarball
+        download; later reads of covered paths are served from disk.
+        """
+        commit_url = f"{self.base_url}/repos/{repo}/commits/{quote(ref, safe='')}"
+        commit_sha = self._make_request(commit_url).json()['sha']
+
+        tree_url = f"{self.base_url}/repos/{repo}/git/trees/{commit_sha}?recursive=1"
+        tree_data = self._make_request(tree_url).json()
+
+        if self.cache:
+            repo_dir = os.path.join(self.cache.cache_dir, 'snapshots', repo.replace('/', '__'))
+            root_dir = os.path.join(repo_dir, commit_sha)
+            if RepositorySnapshot.is_extracted(root_dir):
+                # Mark as recently used, which orders pruning
+                os.utime(root_dir)
+            else:
+                self._download_tarball(repo, commit_sha, root_dir, prefixes)
+            self._prune_snapshots(repo_dir, commit_sha)
+        else:
+            temp_dir = tempfile.TemporaryDirectory(prefix='rhoai-snapshot-')
+            self._temp_dirs.append(temp_dir)
+            root_dir = temp_dir.name
+            self._download_tarball(repo, commit_sha, root_dir, prefixes)
+
+        snapshot = RepositorySnapshot(
+            repo, commit_sha, root_dir, tree_data.get('tree', []), prefixes,
+            truncated=tree_data.get('truncated', False)
+        )
+        self.snapshots[repo] = snapshot
+        return snapshot
+
+    def _prune_snapshots(self, repo_dir: str, current_sha: str) -> None:
+        """Remove the least recently used cached snapshots beyond max_cached_snapshots."""
+        try:
+            entries = [entry for entry in os.scandir(repo_dir)
+                       if entry.is_dir() and entry.name != current_sha]
+            entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        except OSError:
+            return
+        for entry in entries[self.max_cached_snapshots - 1:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _download_tarball(self, repo: str, commit_sha: str, root_dir: str, prefixes: List[str]) -> None:
+        """Stream a repository tarball and extract the requested subtrees."""
+        url = f"{self.base_url}/repos/{repo}/tarball/{commit_sha}"
+        response = self._send(url, stream=True)
+        try:
+            if response.status_code == 404:
+                raise VersionNotFoundError(f"Resource not found: {url}")
+            elif response.status_code != 200:
+                raise GitHubAPIError(f"GitHub API error {response.status_code}: {response.text}")
+
+            response.raw.decode_content = True
+            RepositorySnapshot.extract_tarball(response.raw, root_dir, prefixes)
+        finally:
+            response.close()
+
+        with open(RepositorySnapshot.marker_path(root_dir), 'w') as f:
+            f.write(commit_sha)
+
+    def _snapshot_for(self, repo: str, path: str) -> Optional[RepositorySnapshot]:
+        """Get the snapshot that can answer for a path, if any."""
+        snapshot = self.snapshots.get(repo)
+        if snapshot and snapshot.is_authoritative(path):
+            return snapshot
+        return None
+
     def get_file_content(self, repo: str, file_path: str) -> str:
         """Get file content from GitHub repository."""
+        with self.open_file(repo, file_path) as f:
+            return f.read().decode('utf-8')
+
+    def open_file(self, repo: str, file_path: str) -> IO[bytes]:
+        """Open a repository file as a binary stream.
+
+        Uses the raw media type, so the body is neither JSON-wrapped nor
+        base64-encoded and files above the 1 MB contents API limit work.
+        With a cache the body is streamed to disk in chunks and the cache
+        file is returned; otherwise it is spooled to a temporary file, so the
+        download finishes here and the connection is released.
+        """
+        snapshot = self._snapshot_for(repo, file_path)
+        if snapshot:
+            return snapshot.open_file(file_path)
+
         encoded_path = quote(file_path, safe='/')
         url = f"{self.base_url}/repos/{repo}/contents/{encoded_path}"
+        return self._stream_request(url, RAW_MEDIA_TYPE)
 
-        response = self._make_request(url)
-        data = response.json()
+    def _stream_request(self, url: str, media_type: str) -> IO[bytes]:
+        """Make a streaming GitHub API request, caching the body on disk."""
+        identity = f"{self._auth_identity}:{media_type}"
+        cached = self.cache.get(url, identity) if self.cache else None
+        if cached and cached.is_fresh(self.cache.max_age):
+            return cached.open_body()
 
-        if data.get('encoding') == 'base64':
-            import base64
-            return base64.b64decode(data['content']).decode('utf-8')
-        else:
-            return data.get('content', '')
+        request_headers = {'Accept': media_type}
+        if cached and cached.etag:
+            request_headers['If-None-Match'] = cached.etag
 
-    def list_directory(self, repo: str, dir_path: str) -> List[Dict]:
-        """List files in a directory."""
-        encoded_path = quote(dir_path, safe='/')
-        url = f"{self.base_url}/repos/{repo}/contents/{encoded_path}"
+        response = self._send(url, headers=request_headers, stream=True)
 
-        try:
-            response = self._make_request(url)
-            return response.json()
-        except VersionNotFoundError:
-            return []
+        if response.status_code == 304 and cached:
+            response.close()
+            self.cache.touch(cached, identity)
+            return cached.open_body()
+        elif response.status_code == 404:
+            response.close()
+            raise VersionNotFoundError(f"Resource not found: {url}")
+        elif response.status_code != 200:
+            message = f"GitHub API error {response.status_code}: {response.text}"
+            response.close()
+            raise GitHubAPIError(message)
 
-    def get_olm_catalog(self, rhoai_version: str, ocp_version: str) -> str:
-        """Fetch OLM catalog YAML content."""
-        repo = "red-hat-data-services/RHOAI-Build-Config"
+        if not self.cache:
+            return self._spool_body(response)
 
-        # Try specific version path first
-        file_path = f"catalog/rhoai-{rhoai_version}/v{ocp_version}/rhods-operator/catalog.yaml"
         try:
-            return self.get_file_content(repo, file_path)
-        except VersionNotFoundError:
-            pass
+            entry = self.cache.store_stream(
+                url, identity, response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                etag=response.headers.get('ETag'),
+                headers={'Content-Type': response.headers.get('Content-Type', '')}
+            )
+        finally:
+            response.close()
+        return entry.open_body()
 
-        # Try pre-compiled catalog fallback
-        file_path = f"pcc/catalog-v{ocp_version}.yaml"
+    @staticmethod
+    def _spool_body(response: requests.Response) -> IO[bytes]:
+        """Download a streamed response body into a seekable temporary file."""
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
         try:
-            return self.get_file_content(repo, file_path)
-        except VersionNotFoundError:
-            raise VersionNotFoundError(
-                f"No OLM catalog found for RHOAI {rhoai_version} / OCP {ocp_version}"
-            )
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                body.write(chunk)
+        except BaseException:
+            body.close()
+            raise
+        finally:
+            response.close()
+        body.seek(0)
+        return body
 
-    def get_disconnected_helper(self, rhoai_version: str) -> str:
-        """Fetch disconnected helper markdown content."""
-        repo = "red-hat-data-services/rhoai-disconnected-install-helper"
-        file_path = f"rhoai-{rhoai_version}.md"
+    def list_directory(self, repo: str, dir_path: str) -> List[Dict]:
+        """List files in a directory."""
+        snapshot = self._snapshot_for(repo, dir_path.strip('/') + '/')
+        if snapshot:
+            return snapshot.list_directory(dir_path)
+
+        encoded_path = quote(dir_path, safe='/')
+        url = f"{self.base_url}/repos/{repo}/contents/{encoded_path}"
 
         try:
-            return self.get_file_content(repo, file_path)
+            response = self._make_request(url)
+            return response.json()
         except VersionNotFoundError:
-            # Try legacy RHODS naming
-            file_path = f"rhods-{rhoai_version}.md"
-            return self.get_file_content(repo, file_path)
-
-    def get_latest_versions(self) -> Tuple[str, str]:
-        """Determine latest RHOAI and OCP versions available."""
-        # Get latest RHOAI version from disconnected helper
-        repo = "red-hat-data-services/rhoai-disconnected-install-helper"
-        files = self.list_directory(repo, "")
-
-        rhoai_versions = []
-        for file_info in files:
-            if file_info['type'] == 'file':
-                match = re.match(r'rhoai-(\d+\.\d+)\.md', file_info['name'])
-                if match:
-                    rhoai_versions.append(match.group(1))
-
-        if not rhoai_versions:
-            raise VersionNotFoundError("No RHOAI versions found")
-
-        # Sort versions and get latest
-        rhoai_versions.sort(key=lambda v: [int(x) for x in v.split('.')])
-        latest_rhoai = rhoai_versions[-1]
-
-        # Get latest OCP version from build config
-        build_repo = "red-hat-data-services/RHOAI-Build-Config"
-        catalog_dirs = self.list_directory(build_repo, f"catalog/rhoai-{latest_rhoai}")
-
-        ocp_versions = []
-        for dir_info in catalog_dirs:
-            if dir_info['type'] == 'dir':
-                match = re.match(r'v(\d+\.\d+)', dir_info['name'])
-                if match:
-                    ocp_versions.append(match.group(1))
-
-        if not ocp_versions:
-            # Fallback to common latest version
-            return latest_rhoai, "4.20"
-
-        ocp_versions.sort(key=lambda v: [int(x) for x in v.split('.')])
-        latest_ocp = ocp_versions[-1]
-
-        return latest_rhoai, latest_ocp
\ No newline at end of file
+            return []
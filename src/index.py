@@ -0,0 +1,172 @@
+"""Persistent SQLite index of image digests across analyzed versions."""
+
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from models import Analysis
+from sources import version_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    rhoai_version TEXT NOT NULL,
+    ocp_version TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (rhoai_version, ocp_version)
+);
+CREATE TABLE IF NOT EXISTS images (
+    version_id INTEGER NOT NULL REFERENCES versions (id) ON DELETE CASCADE,
+    digest TEXT,
+    repository TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tag TEXT,
+    component TEXT,
+    source TEXT NOT NULL,
+    full_reference TEXT NOT NULL,
+    UNIQUE (version_id, full_reference, source)
+);
+CREATE INDEX IF NOT EXISTS idx_images_digest ON images (digest);
+CREATE INDEX IF NOT EXISTS idx_images_repository ON images (repository, version_id);
+CREATE INDEX IF NOT EXISTS idx_images_name ON images (name, version_id);
+CREATE INDEX IF NOT EXISTS idx_images_version ON images (version_id);
+"""
+
+
+class DigestIndex:
+    """Records which RHOAI/OCP versions contain each image digest.
+
+    Every analyzed version replaces its own rows, so re-running a version
+    keeps the index current. Repositories are stored both as the full
+    ``registry/namespace/repository`` path and by their last path segment,
+    and either form can be queried.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> 'DigestIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, analysis: Analysis) -> int:
+        """Replace the index rows of the analysis' version with its images.
+
+        A reference listed several times by one source is stored once.
+        Returns the number of rows stored.
+        """
+        components = {}
+        for comp in analysis.components:
+            for img in comp.images:
+                components.setdefault(img.full_reference, comp.name)
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM versions WHERE rhoai_version = ? AND ocp_version = ?",
+                (analysis.rhoai_version, analysis.ocp_version)
+            )
+            version_id = self.connection.execute(
+                "INSERT INTO versions (rhoai_version, ocp_version, indexed_at) VALUES (?, ?, ?)",
+                (analysis.rhoai_version, analysis.ocp_version, time.time())
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO images (version_id, digest, repository, name, tag, component, source, full_reference) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (version_id, img.digest or None, f"{img.registry}/{img.namespace}/{img.repository}",
+                     img.repository, img.tag, components.get(img.full_reference), img.source.value,
+                     img.full_reference)
+                    for img in analysis.images
+                ]
+            )
+            stored, = self.connection.execute(
+                "SELECT COUNT(*) FROM images WHERE version_id = ?", (version_id,)
+            ).fetchone()
+        return stored
+
+    def versions(self) -> List[Dict]:
+        """List indexed versions with their image counts, oldest first."""
+        rows = self.connection.execute(
+            "SELECT v.rhoai_version, v.ocp_version, v.indexed_at, COUNT(i.version_id), COUNT(DISTINCT i.digest) "
+            "FROM versions v LEFT JOIN images i ON i.version_id = v.id GROUP BY v.id"
+        ).fetchall()
+        return sorted(
+            [
+                {'rhoai_version': rhoai, 'ocp_version': ocp, 'indexed_at': indexed_at,
+                 'images': images, 'unique_digests': digests}
+                for rhoai, ocp, indexed_at, images, digests in rows
+            ],
+            key=lambda row: (version_key(row['rhoai_version']), version_key(row['ocp_version']))
+        )
+
+    def find_digest(self, digest: str) -> List[Dict]:
+        """List every version and reference containing a digest, oldest version first."""
+        if not digest.startswith('sha256:'):
+            digest = f"sha256:{digest}"
+        rows = self.connection.execute(
+            "SELECT v.rhoai_version, v.ocp_version, i.full_reference, i.component, i.source "
+            "FROM images i JOIN versions v ON v.id = i.version_id WHERE i.digest = ?",
+            (digest,)
+        ).fetchall()
+        return self._sorted_rows(rows, ('full_reference', 'component', 'source'))
+
+    def repository_history(self, repository: str) -> List[Dict]:
+        """List the digests of a repository in every indexed version, oldest first.
+
+        Each entry carries ``changed``, which is set when the version's digests
+        differ from those of the previous RHOAI version that had the repository.
+        """
+        rows = self.connection.execute(
+            "SELECT v.rhoai_version, v.ocp_version, i.digest FROM images i "
+            "JOIN versions v ON v.id = i.version_id WHERE i.repository = ? OR i.name = ?",
+            (repository, repository)
+        ).fetchall()
+
+        digests_by_version: Dict[Tuple[str, str], set] = {}
+        for rhoai, ocp, digest in rows:
+            digests = digests_by_version.setdefault((rhoai, ocp), set())
+            if digest:
+                digests.add(digest)
+
+        # Compare RHOAI versions on the union of their OCP variants
+        digests_by_rhoai: Dict[str, set] = {}
+        for (rhoai, _), digests in digests_by_version.items():
+            digests_by_rhoai.setdefault(rhoai, set()).update(digests)
+        changed = {}
+        previous = None
+        for rhoai in sorted(digests_by_rhoai, key=version_key):
+            changed[rhoai] = previous is not None and digests_by_rhoai[rhoai] != previous
+            previous = digests_by_rhoai[rhoai]
+
+        return [
+            {'rhoai_version': rhoai, 'ocp_version': ocp,
+             'digests': sorted(digests_by_version[(rhoai, ocp)]), 'changed': changed[rhoai]}
+            for rhoai, ocp in sorted(digests_by_version,
+                                     key=lambda pair: (version_key(pair[0]), version_key(pair[1])))
+        ]
+
+    def last_changed(self, repository: str) -> Optional[str]:
+        """RHOAI version in which a repository's digests last changed, if ever."""
+        changed = [entry['rhoai_version'] for entry in self.repository_history(repository) if entry['changed']]
+        return changed[-1] if changed else None
+
+    @staticmethod
+    def _sorted_rows(rows: List[tuple], columns: Tuple[str, ...]) -> List[Dict]:
+        """Turn (rhoai, ocp, *columns) rows into dicts ordered by version."""
+        return sorted(
+            [dict(zip(('rhoai_version', 'ocp_version') + columns, row)) for row in rows],
+            key=lambda row: (version_key(row['rhoai_version']), version_key(row['ocp_version']))
+        )
@@ -0,0 +1,92 @@
+"""Compiled first-match-wins rule matching for image names."""
+
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Escapes that stand for a single literal character
+_LITERAL_ESCAPES = set('.-_/@:+*?()[]{}|^$\\')
+
+
+def required_literal(pattern: str) -> str:
+    """Get a substring that every match of a pattern must contain, or ''.
+
+    Deliberately conservative: only literal runs ahead of the first group or
+    character class count, and patterns with alternation yield nothing.
+    """
+    if '|' in pattern:
+        return ''
+
+    runs: List[str] = []
+    run = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in '?*+{':
+            # A quantified character may be absent or repeated: end the run before it
+            if char == '{':
+                close = pattern.find('}', i)
+                if close == -1:
+                    break
+                i = close
+            if char != '+':
+                run = run[:-1]
+            runs.append(run)
+            run = ''
+        elif char == '\\' and pattern[i + 1:i + 2] in _LITERAL_ESCAPES:
+            i += 1
+            run += pattern[i]
+        elif char in '([\\':
+            break
+        elif char in '.^$':
+            runs.append(run)
+            run = ''
+        else:
+            run += char
+        i += 1
+
+    runs.append(run)
+    return max((run for run in runs if '\n' not in run), key=len, default='')
+
+
+class RuleMatcher:
+    """Ordered regex rules compiled once, returning the first matching rule.
+
+    Each rule is compiled up front together with a literal it requires, so a
+    rule whose literal is absent is skipped with a substring test instead of
+    a regex call. Rules are tried in order, so the first matching rule wins
+    exactly as in a loop over ``re.search`` (or ``re.match`` when
+    ``anchored`` is set).
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, Any]], anchored: bool = False):
+        self.rules = list(rules)
+        self.anchored = anchored
+        self._compiled = [
+            (required_literal(pattern), getattr(re.compile(pattern), 'match' if anchored else 'search'))
+            for pattern, _ in self.rules
+        ]
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str], anchored: bool = False) -> 'RuleMatcher':
+        """Build a matcher whose rule values are the patterns themselves."""
+        return cls(((pattern, pattern) for pattern in patterns), anchored)
+
+    def first_index(self, *texts: str) -> Optional[int]:
+        """Get the index of the first rule matching any of the texts."""
+        # Literals never contain a newline, so they cannot match across the join
+        haystack = texts[0] if len(texts) == 1 else '\n'.join(texts)
+        for index, (literal, find) in enumerate(self._compiled):
+            if literal in haystack:
+                for text in texts:
+                    if find(text):
+                        return index
+        return None
+
+    def first(self, *texts: str, default: Any = None) -> Any:
+        """Get the value of the first rule matching any of the texts."""
+        index = self.first_index(*texts)
+        return default if index is None else self.rules[index][1]
+
+    def matches(self, text: str) -> bool:
+        """Check whether any rule matches the text."""
+        return self.first_index(text) is not None
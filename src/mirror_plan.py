@@ -0,0 +1,124 @@
+"""Multi-version mirror planning against an existing mirror set."""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from models import ImageReference, MirrorDelta, MirrorPlan
+
+DIGEST_RE = re.compile(r'sha256:[0-9a-f]{64}')
+IMAGE_SET_API_VERSION = "mirror.openshift.io/v2alpha1"
+
+
+def load_mirror_set(path: str) -> Set[str]:
+    """Read already-mirrored references from a list file or an ImageSetConfiguration.
+
+    List files hold one reference per line; blank lines and ``#`` comments
+    are ignored. A bare digest marks that digest as held in every repository.
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+
+    if 'ImageSetConfiguration' in content:
+        config = yaml.safe_load(content) or {}
+        additional = (config.get('mirror') or {}).get('additionalImages') or []
+        return {entry['name'] for entry in additional if entry.get('name')}
+
+    references = set()
+    for line in content.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            references.add(line)
+    return references
+
+
+def image_set_configuration(plan: MirrorPlan) -> str:
+    """Render the plan's images as an oc-mirror ImageSetConfiguration."""
+    config = {
+        'kind': 'ImageSetConfiguration',
+        'apiVersion': IMAGE_SET_API_VERSION,
+        'mirror': {
+            'additionalImages': [{'name': reference} for reference in plan.images]
+        }
+    }
+    return yaml.safe_dump(config, sort_keys=False)
+
+
+class MirrorPlanner:
+    """Builds incremental mirror plans from the images of several versions.
+
+    Images are tracked as their original pull references, because a mirror
+    needs every repository a digest is pulled from. References that name
+    no registry cannot be pulled, so they are reported as skipped instead
+    of planned. Versions are processed in the order given, and each one
+    only adds what neither the existing mirror set nor an earlier version
+    already holds.
+    """
+
+    def __init__(self, existing: Iterable[str] = ()):
+        self.existing_references: Set[str] = set()
+        self.existing_digests: Set[str] = set()
+        for reference in existing:
+            if DIGEST_RE.fullmatch(reference):
+                self.existing_digests.add(reference)
+            else:
+                self.existing_references.add(reference)
+
+    @staticmethod
+    def pull_reference(image: ImageReference) -> Optional[str]:
+        """Reference a mirror pulls for an image, as listed by its source; None if it names no registry.
+
+        A tag next to a digest is dropped, since the digest alone decides what is pulled.
+        """
+        if image.registry == 'unknown':
+            return None
+        reference = image.image
+        name, at, digest = reference.partition('@')
+        if at and ':' in name.rsplit('/', 1)[-1]:
+            return f"{name.rsplit(':', 1)[0]}@{digest}"
+        return reference
+
+    def is_mirrored(self, reference: str) -> bool:
+        """Check whether the existing mirror set already holds a reference."""
+        if reference in self.existing_references:
+            return True
+        match = DIGEST_RE.search(reference)
+        return bool(match) and match.group(0) in self.existing_digests
+
+    def plan(self, versions: List[Tuple[str, str, List[ImageReference]]]) -> MirrorPlan:
+        """Plan the mirror for (rhoai_version, ocp_version, images) entries, in order."""
+        planned: Dict[str, None] = {}
+        all_references: Set[str] = set()
+        deltas = []
+        for rhoai_version, ocp_version, images in versions:
+            references = set()
+            skipped = set()
+            for image in images:
+                reference = self.pull_reference(image)
+                if reference is None:
+                    skipped.add(image.image)
+                else:
+                    references.add(reference)
+            references = sorted(references)
+            all_references.update(references)
+
+            delta = MirrorDelta(rhoai_version=rhoai_version, ocp_version=ocp_version,
+                                total_images=len(references), already_mirrored=0, from_earlier_versions=0,
+                                skipped=sorted(skipped))
+            for reference in references:
+                if self.is_mirrored(reference):
+                    delta.already_mirrored += 1
+                elif reference in planned:
+                    delta.from_earlier_versions += 1
+                else:
+                    planned[reference] = None
+                    delta.new_images.append(reference)
+            deltas.append(delta)
+
+        return MirrorPlan(
+            deltas=deltas,
+            images=list(planned),
+            total_images=len(all_references),
+            existing_images=len(self.existing_references) + len(self.existing_digests)
+        )
@@ -1,7 +1,9 @@
 """Data models for RHOAI container image analysis."""
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
 from enum import Enum
 
 
@@ -18,34 +20,278 @@ class ImageClassification(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Image URLs in the common registry/namespace/repository(@digest|:tag) form.
+# Anything else goes through the general rules in ImageReference.from_url.
+IMAGE_URL_RE = re.compile(
+    r'(?!sha256:)(?P<registry>[^/@]+)/(?P<namespace>[^/@]+)/(?P<repository>[^@]+)'
+    r'(?:@(?P<digest>sha256:[^@]*)|:(?P<tag>[^:/@]*))'
+)
+
+
+def _intern(value):
+    """Intern a string value, leaving other values unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _pack_digest(value):
+    """Convert a lowercase ``sha256:<hex>`` digest to 32 raw bytes."""
+    if type(value) is str and len(value) == 71 and value.startswith('sha256:'):
+        try:
+            raw = bytes.fromhex(value[7:])
+        except ValueError:
+            return value
+        # Only lowercase hex round-trips unchanged
+        if raw.hex() == value[7:]:
+            return raw
+    return value
+
+
+class _Field:
+    """Slot-backed attribute with optional string interning.
+
+    Identity fields (the parts an image URL is rebuilt from) pin the stored
+    ``image`` and drop memoized reference strings before they change.
+    """
+
+    def __init__(self, intern: bool = False, identity: bool = False):
+        self.intern = intern
+        self.identity = identity
+
+    def __set_name__(self, owner, name):
+        self.slot = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj, value):
+        if self.identity:
+            obj._identity_changing()
+        if self.intern:
+            value = _intern(value)
+        setattr(obj, self.slot, value)
+
+
+class _DigestField(_Field):
+    """Digest attribute holding ``sha256:<hex>`` values as 32 raw bytes."""
+
+    def __init__(self):
+        super().__init__(identity=True)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if type(value) is bytes:
+            return 'sha256:' + value.hex()
+        return value
+
+    def __set__(self, obj, value):
+        obj._identity_changing()
+        setattr(obj, self.slot, _pack_digest(value))
+
+
 class ImageReference:
-    """Container image reference with metadata."""
-    image: str
-    digest: str
-    registry: str
-    namespace: str
-    repository: str
-    tag: Optional[str] = None
-    semantic_name: Optional[str] = None
-    source: ImageSource = ImageSource.OLM_CATALOG
-    classification: ImageClassification = ImageClassification.UNKNOWN
-    category: Optional[str] = None
-    base_os: Optional[str] = None
-    architecture: Optional[str] = None
-    python_version: Optional[str] = None
-    gpu_support: Optional[str] = None
-    variant_type: Optional[str] = None  # workbench, pipeline, notebook, runtime
+    """Container image reference with metadata.
+
+    Slotted to avoid a per-instance __dict__. Strings repeated across
+    bundles (registry, namespace, repository, names, analysis labels) are
+    interned, sha256 digests are held as raw bytes, and ``image`` is only
+    stored when it differs from the reference rebuilt from its parts.
+    ``full_reference`` and the lowercased name forms are memoized until an
+    identity field changes.
+    """
+
+    __slots__ = (
+        '_image', '_digest', '_registry', '_namespace', '_repository', '_tag',
+        '_semantic_name', 'source', 'classification', '_category', '_base_os',
+        '_architecture', 'python_version', 'gpu_support', '_variant_type',
+        '_full_reference', '_repository_lower', '_full_reference_lower'
+    )
+
+    # Field order matches the constructor and to_record()
+    FIELDS = (
+        'image', 'digest', 'registry', 'namespace', 'repository', 'tag',
+        'semantic_name', 'source', 'classification', 'category', 'base_os',
+        'architecture', 'python_version', 'gpu_support', 'variant_type'
+    )
+
+    digest = _DigestField()
+    registry = _Field(intern=True, identity=True)
+    namespace = _Field(intern=True, identity=True)
+    repository = _Field(intern=True, identity=True)
+    tag = _Field(intern=True, identity=True)
+    semantic_name = _Field(intern=True)
+    category = _Field(intern=True)
+    base_os = _Field(intern=True)
+    architecture = _Field(intern=True)
+    variant_type = _Field(intern=True)  # workbench, pipeline, notebook, runtime
+
+    def __init__(self, image: str, digest: str, registry: str, namespace: str, repository: str,
+                 tag: Optional[str] = None, semantic_name: Optional[str] = None,
+                 source: ImageSource = ImageSource.OLM_CATALOG,
+                 classification: ImageClassification = ImageClassification.UNKNOWN,
+                 category: Optional[str] = None, base_os: Optional[str] = None,
+                 architecture: Optional[str] = None, python_version: Optional[str] = None,
+                 gpu_support: Optional[str] = None, variant_type: Optional[str] = None):
+        # Slots are filled directly; the descriptors only guard later assignments
+        self._digest = _pack_digest(digest)
+        self._registry = _intern(registry)
+        self._namespace = _intern(namespace)
+        self._repository = _intern(repository)
+        self._tag = _intern(tag)
+        self._semantic_name = _intern(semantic_name)
+        self.source = source
+        self.classification = classification
+        self._category = _intern(category)
+        self._base_os = _intern(base_os)
+        self._architecture = _intern(architecture)
+        self.python_version = python_version
+        self.gpu_support = gpu_support
+        self._variant_type = _intern(variant_type)
+        self._full_reference = self._repository_lower = self._full_reference_lower = None
+        # Set last: whether it needs storing depends on the identity fields
+        self.image = image
+
+    @property
+    def image(self) -> str:
+        """Original image URL."""
+        if self._image is None:
+            return self.full_reference
+        return self._image
+
+    @image.setter
+    def image(self, value: str) -> None:
+        self._image = None if value == self.full_reference else value
+
+    def _identity_changing(self) -> None:
+        """Store a derived image URL and drop memoized strings before an identity field changes."""
+        if self._image is None:
+            self._image = self.full_reference
+        self._full_reference = None
+        self._repository_lower = None
+        self._full_reference_lower = None
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_record() == other.to_record()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{self.__class__.__name__}({fields})"
+
+    def __getstate__(self):
+        return self.to_record()
+
+    def __setstate__(self, state):
+        self.__init__(*state[:7], ImageSource(state[7]), ImageClassification(state[8]), *state[9:])
 
     @property
     def full_reference(self) -> str:
         """Get full image reference."""
-        if self.digest:
-            return f"{self.registry}/{self.namespace}/{self.repository}@{self.digest}"
-        elif self.tag:
-            return f"{self.registry}/{self.namespace}/{self.repository}:{self.tag}"
-        else:
-            return f"{self.registry}/{self.namespace}/{self.repository}"
+        reference = self._full_reference
+        if reference is None:
+            if self.digest:
+                reference = f"{self.registry}/{self.namespace}/{self.repository}@{self.digest}"
+            elif self.tag:
+                reference = f"{self.registry}/{self.namespace}/{self.repository}:{self.tag}"
+            else:
+                reference = f"{self.registry}/{self.namespace}/{self.repository}"
+            self._full_reference = reference
+        return reference
+
+    @property
+    def repository_lower(self) -> str:
+        """Get the lowercased repository name."""
+        value = self._repository_lower
+        if value is None:
+            value = self._repository_lower = self.repository.lower()
+        return value
+
+    @property
+    def full_reference_lower(self) -> str:
+        """Get the lowercased full image reference."""
+        value = self._full_reference_lower
+        if value is None:
+            value = self._full_reference_lower = self.full_reference.lower()
+        return value
+
+    def to_record(self) -> tuple:
+        """Flatten into a tuple of plain values for compact serialization."""
+        return (
+            self.image, self.digest, self.registry, self.namespace, self.repository, self.tag,
+            self.semantic_name, self.source.value, self.classification.value, self.category,
+            self.base_os, self.architecture, self.python_version, self.gpu_support, self.variant_type
+        )
+
+    @classmethod
+    def from_record(cls, record: tuple) -> 'ImageReference':
+        """Rebuild an image reference from to_record() output."""
+        (image, digest, registry, namespace, repository, tag, semantic_name, source,
+         classification, category, base_os, architecture, python_version, gpu_support,
+         variant_type) = record
+        return cls(
+            image=image,
+            digest=digest,
+            registry=registry,
+            namespace=namespace,
+            repository=repository,
+            tag=tag,
+            semantic_name=semantic_name,
+            source=ImageSource(source),
+            classification=ImageClassification(classification),
+            category=category,
+            base_os=base_os,
+            architecture=architecture,
+            python_version=python_version,
+            gpu_support=gpu_support,
+            variant_type=variant_type
+        )
+
+    @classmethod
+    def from_urls(cls, image_urls: Iterable[str],
+                  source: ImageSource = ImageSource.OLM_CATALOG) -> List['ImageReference']:
+        """Parse a batch of image URLs with a single compiled pattern.
+
+        Matched URLs fill the slots directly; since the URL is exactly the
+        rebuilt reference, it also seeds the ``full_reference`` memo.
+        """
+        images = []
+        match_url = IMAGE_URL_RE.fullmatch
+        new = cls.__new__
+        intern = sys.intern
+        for image_url in image_urls:
+            match = match_url(image_url)
+            if match is None:
+                # Untagged or unusual shapes (ports without tags, missing parts) keep the general rules
+                images.append(cls.from_url(image_url, source))
+                continue
+            registry, namespace, repository, digest, tag = match.groups()
+            image = new(cls)
+            image._digest = _pack_digest(digest)
+            image._registry = intern(registry)
+            image._namespace = intern(namespace)
+            image._repository = intern(repository)
+            image._tag = None if tag is None else intern(tag)
+            image._semantic_name = image._category = image._base_os = None
+            image._architecture = image._variant_type = None
+            image.python_version = image.gpu_support = None
+            image.source = source
+            image.classification = ImageClassification.UNKNOWN
+            image._repository_lower = image._full_reference_lower = None
+            if tag == '':
+                # An empty tag is dropped from the rebuilt reference
+                image._image = image_url
+                image._full_reference = None
+            else:
+                image._image = None
+                image._full_reference = image_url
+            images.append(image)
+        return images
 
     @classmethod
     def from_url(cls, image_url: str, source: ImageSource = ImageSource.OLM_CATALOG) -> 'ImageReference':
@@ -135,15 +381,32 @@ class SecurityInsights:
     recommendations: List[str]
 
 
+@dataclass
+class ImageUpdate:
+    """Same image rebuilt under a new digest between two versions."""
+    previous: ImageReference
+    current: ImageReference
+
+
 @dataclass
 class VersionComparison:
     """Comparison between two versions."""
     added_images: List[ImageReference]
     removed_images: List[ImageReference]
-    updated_images: List[ImageReference]
+    updated_images: List[ImageUpdate]
     unchanged_images: List[ImageReference]
 
 
+@dataclass
+class MirrorSize:
+    """Compressed download size of a set of images, from their registry manifests."""
+    total_bytes: int  # Every layer and config blob counted once
+    naive_bytes: int  # Sum of per-image sizes, shared layers counted repeatedly
+    unique_blobs: int
+    images_sized: int
+    unresolved: List[str] = field(default_factory=list)
+
+
 @dataclass
 class Analysis:
     """Complete analysis results."""
@@ -156,6 +419,41 @@ class Analysis:
     registry_analysis: RegistryAnalysis
     security_insights: SecurityInsights
     comparison: Optional[VersionComparison] = None
+    # Every analyzed reference in input order, used for incremental updates
+    images: List[ImageReference] = field(default_factory=list)
+    # Registry-derived download size, filled by the optional manifest enrichment
+    mirror_size: Optional[MirrorSize] = None
+
+
+@dataclass
+class MatrixResult:
+    """Outcome of analyzing one RHOAI/OCP pair of a version matrix."""
+    rhoai_version: str
+    ocp_version: str
+    analysis: Optional[Analysis] = None
+    error: Optional[str] = None
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class MirrorDelta:
+    """What one version of a mirror plan adds on top of everything held before it."""
+    rhoai_version: str
+    ocp_version: str
+    total_images: int
+    already_mirrored: int  # Held by the existing mirror set
+    from_earlier_versions: int  # Added by an earlier version of the same plan
+    new_images: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # References naming no registry, left out of the plan
+
+
+@dataclass
+class MirrorPlan:
+    """Minimal set of image references to mirror for several versions."""
+    deltas: List[MirrorDelta]
+    images: List[str]  # Union of all versions minus the existing mirror set
+    total_images: int  # Unique references across all versions
+    existing_images: int  # Size of the existing mirror set
 
 
 @dataclass
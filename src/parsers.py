@@ -1,24 +1,141 @@
 """Parsers for OLM catalogs and disconnected helper data."""
 
+import json
+import multiprocessing
+import os
 import re
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader
+    LIBYAML_AVAILABLE = False
+
+from cache import ParsedCache
 from exceptions import DataParsingError
 from models import ImageReference, ImageSource
 
 
+def split_yaml_documents(yaml_content: str, target_chunks: int) -> List[str]:
+    """Split a multi-document YAML stream into about target_chunks chunks.
+
+    Splits only on "---" document markers at the start of a line, so each
+    chunk is itself a valid multi-document stream and chunk order matches
+    document order. Streams with directives are returned whole.
+    """
+    if yaml_content.lstrip().startswith('%'):
+        return [yaml_content]
+
+    boundaries = [match.start() for match in DOCUMENT_START_RE.finditer(yaml_content)]
+    if not boundaries or boundaries[0] != 0:
+        boundaries.insert(0, 0)
+    boundaries.append(len(yaml_content))
+
+    chunk_size = max(1, len(yaml_content) // max(1, target_chunks))
+    chunks = []
+    chunk_start = 0
+    for boundary in boundaries[1:]:
+        if boundary - chunk_start >= chunk_size or boundary == len(yaml_content):
+            chunks.append(yaml_content[chunk_start:boundary])
+            chunk_start = boundary
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _parse_catalog_chunk(task: Tuple[str, bool]) -> List[tuple]:
+    """Worker entry point: parse one chunk of catalog documents into records."""
+    chunk, streaming = task
+    parser = OLMCatalogParser(streaming=streaming)
+    return [image.to_record() for image in parser.parse_catalog(chunk)]
+
+
+def _cached_parse(cache: Optional[ParsedCache], kind: str, content, content_key: Optional[str],
+                  parse) -> List[ImageReference]:
+    """Run a parse function behind the content-addressed parsed cache."""
+    if cache is not None and content_key is None:
+        content_key = ParsedCache.content_key(content)
+    if cache is None or content_key is None:
+        return parse(content)
+
+    records = cache.get(kind, content_key)
+    if records is not None:
+        return [ImageReference.from_record(record) for record in records]
+
+    images = parse(content)
+    cache.put(kind, content_key, [image.to_record() for image in images])
+    return images
+
+
+# Top-level bundle keys needed to extract images; everything else is skipped
+BUNDLE_FIELDS = ('schema', 'name', 'image', 'relatedImages')
+
+# Plain YAML scalars that load as null
+NULL_SCALARS = ('', '~', 'null', 'Null', 'NULL')
+
+# Document start markers where a catalog stream can be split for parallel parsing
+DOCUMENT_START_RE = re.compile(r'^---(?=[ \t\r\n]|$)', re.MULTILINE)
+
+# Catalogs smaller than this are parsed serially; pool start-up would dominate
+PARALLEL_MIN_BYTES = 1024 * 1024
+PARALLEL_CHUNKS_PER_JOB = 4
+
+
+
+def process_pool_context() -> multiprocessing.context.BaseContext:
+    """Start method for worker pools: a fork server, or spawn where there is none.
+
+    Forking copies locks held by the caller's threads, such as fetch pools
+    or a progress display, into the workers.
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(start_method)
+
 class OLMCatalogParser:
     """Parser for OLM catalog YAML files."""
 
-    def parse_catalog(self, yaml_content: str) -> List[ImageReference]:
-        """Extract images from OLM catalog YAML."""
+    def __init__(self, streaming: bool = True, cache: Optional[ParsedCache] = None, jobs: int = 1):
+        # Streaming mode walks parser events and never builds skipped subtrees
+        self.streaming = streaming
+        self.cache = cache
+        # Worker processes for large YAML catalogs; 0 means one per CPU
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+
+    def parse_catalog(self, yaml_content: Union[str, IO],
+                      content_key: Optional[str] = None) -> List[ImageReference]:
+        """Extract images from OLM catalog YAML text or a readable stream.
+
+        With a cache, results are looked up by ``content_key`` (for example a
+        blob SHA), or by a hash of the content when it is text or a seekable stream.
+        """
+        return _cached_parse(self.cache, 'olm', yaml_content, content_key, self._parse_catalog)
+
+    def _parse_catalog(self, yaml_content: Union[str, IO]) -> List[ImageReference]:
+        """Parse a catalog without consulting the cache."""
         images = []
 
         try:
-            # Parse multi-document YAML
-            documents = list(yaml.safe_load_all(yaml_content))
+            catalog_format, yaml_content = self._detect_format(yaml_content)
+            if catalog_format == 'yaml' and self.jobs > 1:
+                if not isinstance(yaml_content, (str, bytes)):
+                    yaml_content = yaml_content.read()
+                if isinstance(yaml_content, bytes):
+                    yaml_content = yaml_content.decode('utf-8')
+                if len(yaml_content) >= PARALLEL_MIN_BYTES:
+                    chunks = split_yaml_documents(yaml_content, self.jobs * PARALLEL_CHUNKS_PER_JOB)
+                    if len(chunks) > 1:
+                        return self._parse_chunks_parallel(chunks)
+
+            if catalog_format == 'json':
+                documents = self.iter_json_documents(yaml_content)
+            elif self.streaming:
+                documents = self.iter_bundle_documents(yaml_content)
+            else:
+                # Parse multi-document YAML
+                documents = list(yaml.load_all(yaml_content, Loader=SafeLoader))
 
             for doc in documents:
                 if not isinstance(doc, dict):
@@ -31,13 +148,148 @@ class OLMCatalogParser:
                     bundle_images = self._extract_bundle_images(doc)
                     images.extend(bundle_images)
 
+        except DataParsingError:
+            raise
         except yaml.YAMLError as e:
             raise DataParsingError(f"Failed to parse OLM catalog YAML: {e}")
+        except json.JSONDecodeError as e:
+            raise DataParsingError(f"Failed to parse OLM catalog JSON: {e}")
         except Exception as e:
             raise DataParsingError(f"Error processing OLM catalog: {e}")
 
         return images
 
+    def _parse_chunks_parallel(self, chunks: List[str]) -> List[ImageReference]:
+        """Parse catalog chunks in worker processes, keeping document order."""
+        images = []
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(chunks)),
+                                 mp_context=process_pool_context()) as executor:
+            tasks = [(chunk, self.streaming) for chunk in chunks]
+            for records in executor.map(_parse_catalog_chunk, tasks):
+                images.extend(ImageReference.from_record(record) for record in records)
+        return images
+
+    def _detect_format(self, content: Union[str, bytes, IO]) -> Tuple[str, Union[str, bytes, IO]]:
+        """Detect whether a catalog is YAML or File-Based Catalog JSON.
+
+        Buffered binary streams are peeked at and seekable ones rewound;
+        other streams are read in full, so the returned content must be used
+        in place of the input.
+        """
+        if isinstance(content, (str, bytes)):
+            head = content[:256]
+        elif hasattr(content, 'peek'):
+            head = content.peek(256)[:256]
+        elif hasattr(content, 'seekable') and content.seekable():
+            position = content.tell()
+            head = content.read(256)
+            content.seek(position)
+        else:
+            content = content.read()
+            head = content[:256]
+
+        if isinstance(head, bytes):
+            head = head.decode('utf-8', 'ignore')
+        # FBC JSON is a stream of objects; YAML catalogs start with a key or '---'
+        if head.lstrip('\ufeff \t\r\n').startswith('{'):
+            return 'json', content
+        return 'yaml', content
+
+    def iter_json_documents(self, json_content: Union[str, bytes, IO]) -> Iterator[dict]:
+        """Yield the objects of a catalog.json, which may hold concatenated JSON objects."""
+        if not isinstance(json_content, (str, bytes)):
+            json_content = json_content.read()
+        if isinstance(json_content, bytes):
+            json_content = json_content.decode('utf-8')
+
+        decoder = json.JSONDecoder()
+        whitespace = re.compile(r'[\s\ufeff]*')
+        position = whitespace.match(json_content, 0).end()
+        while position < len(json_content):
+            doc, position = decoder.raw_decode(json_content, position)
+            yield doc
+            position = whitespace.match(json_content, position).end()
+
+    def iter_bundle_documents(self, yaml_content: Union[str, IO]) -> Iterator[dict]:
+        """Yield bundle documents one at a time, holding only the fields needed.
+
+        Works on the YAML event stream: documents whose ``schema`` is not
+        ``olm.bundle`` are skipped as soon as the schema is seen, and keys
+        outside BUNDLE_FIELDS (properties, icons, ...) are never constructed.
+        """
+        events = yaml.parse(yaml_content, Loader=SafeLoader)
+        for event in events:
+            if isinstance(event, yaml.DocumentStartEvent):
+                doc = self._read_bundle_document(events)
+                if doc is not None and doc.get('schema') == 'olm.bundle':
+                    yield doc
+
+    def _read_bundle_document(self, events: Iterator[yaml.Event]) -> Optional[dict]:
+        """Read one document's bundle fields, consuming events through its end."""
+        doc = None
+        root = next(events)
+        if isinstance(root, yaml.MappingStartEvent):
+            doc = {}
+            for key_event in events:
+                if isinstance(key_event, yaml.MappingEndEvent):
+                    break
+
+                value_event = None
+                if isinstance(key_event, yaml.ScalarEvent) and key_event.value in BUNDLE_FIELDS:
+                    value_event = next(events)
+                    doc[key_event.value] = self._build_value(value_event, events)
+                else:
+                    self._skip_node(key_event, events)
+                    self._skip_node(next(events), events)
+
+                if value_event is not None and key_event.value == 'schema' and doc['schema'] != 'olm.bundle':
+                    # Not a bundle: discard the rest of the document unbuilt
+                    self._skip_node(yaml.MappingStartEvent(None, None, True), events)
+                    doc = None
+                    break
+        else:
+            self._skip_node(root, events)
+
+        for event in events:
+            if isinstance(event, yaml.DocumentEndEvent):
+                break
+        return doc
+
+    def _build_value(self, event: yaml.Event, events: Iterator[yaml.Event]):
+        """Construct plain Python data for one node from its events."""
+        if isinstance(event, yaml.ScalarEvent):
+            if event.implicit[0] and event.value in NULL_SCALARS:
+                return None
+            return event.value
+        if isinstance(event, yaml.SequenceStartEvent):
+            items = []
+            for item_event in events:
+                if isinstance(item_event, yaml.SequenceEndEvent):
+                    return items
+                items.append(self._build_value(item_event, events))
+        if isinstance(event, yaml.MappingStartEvent):
+            mapping = {}
+            for key_event in events:
+                if isinstance(key_event, yaml.MappingEndEvent):
+                    return mapping
+                key = self._build_value(key_event, events)
+                mapping[key] = self._build_value(next(events), events)
+        # Aliases are not used in file-based catalogs
+        return None
+
+    def _skip_node(self, event: yaml.Event, events: Iterator[yaml.Event]) -> None:
+        """Consume the events of one node without constructing it."""
+        if not isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            return
+        depth = 1
+        for inner in events:
+            if isinstance(inner, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+                depth += 1
+            elif isinstance(inner, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                depth -= 1
+                if depth == 0:
+                    return
+
     def _extract_bundle_images(self, bundle_data: dict) -> List[ImageReference]:
         """Extract images from a bundle document."""
         images = []
@@ -51,33 +303,63 @@ class OLMCatalogParser:
             images.append(img_ref)
 
         # Extract related images
-        related_images = bundle_data.get('relatedImages', [])
-        for related in related_images:
-            if isinstance(related, dict):
-                image_url = related.get('image')
-                if image_url:
-                    img_ref = ImageReference.from_url(image_url, ImageSource.OLM_CATALOG)
-                    img_ref.semantic_name = related.get('name', '')
-                    img_ref.category = 'related'
-                    images.append(img_ref)
+        related_images = [
+            related for related in bundle_data.get('relatedImages', [])
+            if isinstance(related, dict) and related.get('image')
+        ]
+        related_refs = ImageReference.from_urls(
+            [related['image'] for related in related_images], ImageSource.OLM_CATALOG)
+        for related, img_ref in zip(related_images, related_refs):
+            img_ref.semantic_name = related.get('name', '')
+            img_ref.category = 'related'
+            images.append(img_ref)
 
         return images
 
 
+# Image reference with a sha256 digest, as listed in the helper markdown
+IMAGE_DIGEST_PATTERN = r'[a-zA-Z0-9.-]+(?:\:[0-9]+)?/[a-zA-Z0-9._/-]+@sha256:[a-f0-9]{64}'
+
+# One pass over the buffer: either a level-2 category header line, or a line
+# holding an image reference, captured up to its end so that line-level
+# checks need no further scanning
+HELPER_SCAN_RE = re.compile(
+    r'^[ \t\r\f\v]*(?:'
+    r'(?P<header>##(?!#)[^\n]*)'
+    r'|(?P<item>- )?[^\n]*?(?P<image>' + IMAGE_DIGEST_PATTERN + r')[^\n]*'
+    r')',
+    re.MULTILINE
+)
+CATEGORY_INVALID_CHARS_RE = re.compile(r'[^a-z0-9_]')
+
+# Chunk size used when scanning a helper file from a stream
+HELPER_STREAM_CHUNK_SIZE = 256 * 1024
+
+
 class DisconnectedHelperParser:
     """Parser for disconnected helper markdown files."""
 
-    def parse_markdown(self, md_content: str) -> List[ImageReference]:
-        """Extract images from markdown lists."""
+    def __init__(self, cache: Optional[ParsedCache] = None):
+        self.cache = cache
+
+    def parse_markdown(self, md_content: Union[str, bytes, IO],
+                       content_key: Optional[str] = None) -> List[ImageReference]:
+        """Extract images from markdown lists given as text, bytes or a readable stream."""
+        return _cached_parse(self.cache, 'helper', md_content, content_key, self._parse_markdown)
+
+    def _parse_markdown(self, md_content: Union[str, bytes, IO]) -> List[ImageReference]:
+        """Parse helper markdown without consulting the cache."""
         images = []
 
         try:
             # Extract image categories and their images
-            categories = self._categorize_images(md_content)
+            if isinstance(md_content, str):
+                categories = self._categorize_images(md_content)
+            else:
+                categories = self.categorize_stream(md_content)
 
             for category, image_list in categories.items():
-                for image_url in image_list:
-                    img_ref = ImageReference.from_url(image_url, ImageSource.DISCONNECTED_HELPER)
+                for img_ref in ImageReference.from_urls(image_list, ImageSource.DISCONNECTED_HELPER):
                     img_ref.category = category
                     images.append(img_ref)
 
@@ -88,40 +370,59 @@ class DisconnectedHelperParser:
 
     def _categorize_images(self, content: str) -> Dict[str, List[str]]:
         """Group images by category from markdown content."""
+        categories = {}
+        self._scan(content, categories, "general")
+        return categories
+
+    def categorize_stream(self, source: Union[bytes, IO]) -> Dict[str, List[str]]:
+        """Group images by category, reading bytes or a file object in chunks."""
+        if isinstance(source, bytes):
+            return self._categorize_images(source.decode('utf-8'))
+
         categories = {}
         current_category = "general"
+        pending = ''
+        while True:
+            chunk = source.read(HELPER_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                # Incomplete multi-byte sequences are carried over with the partial line
+                pending = pending.encode('utf-8') + chunk if isinstance(pending, str) else pending + chunk
+                cut = pending.rfind(b'\n') + 1
+                complete, pending = pending[:cut].decode('utf-8'), pending[cut:]
+            else:
+                pending += chunk
+                cut = pending.rfind('\n') + 1
+                complete, pending = pending[:cut], pending[cut:]
+            current_category = self._scan(complete, categories, current_category)
 
-        lines = content.split('\n')
+        if isinstance(pending, bytes):
+            pending = pending.decode('utf-8')
+        self._scan(pending, categories, current_category)
+        return categories
 
-        for line in lines:
-            line = line.strip()
+    def _scan(self, buffer: str, categories: Dict[str, List[str]], current_category: str) -> str:
+        """Scan whole lines of markdown, returning the category in effect at the end.
 
-            # Detect category headers
-            if line.startswith('##') and not line.startswith('###'):
+        A level-2 header starts a new category. The first image reference on
+        a list item ("- ...") or "name:" line is recorded under the current
+        category; images before any header fall under "general". Each match
+        spans one line, so lines are never split or stripped.
+        """
+        for match in HELPER_SCAN_RE.finditer(buffer):
+            header = match.group('header')
+            if header is not None:
                 # Extract category name
-                category = line.replace('##', '').strip().lower()
-                category = re.sub(r'[^a-z0-9_]', '_', category)
-                current_category = category
+                category = header.replace('##', '').strip().lower()
+                current_category = CATEGORY_INVALID_CHARS_RE.sub('_', category)
+                if current_category not in categories:
+                    categories[current_category] = []
+
+            # The match holds the whole line, with its first image reference
+            elif match.group('item') or 'name:' in match.group(0):
                 if current_category not in categories:
                     categories[current_category] = []
+                categories[current_category].append(match.group('image'))
 
-            # Extract image references
-            elif line.startswith('- ') and '@sha256:' in line:
-                # Extract image URL from markdown list item
-                image_match = re.search(r'([a-zA-Z0-9.-]+(?:\:[0-9]+)?/[a-zA-Z0-9._/-]+@sha256:[a-f0-9]{64})', line)
-                if image_match:
-                    image_url = image_match.group(1)
-                    if current_category not in categories:
-                        categories[current_category] = []
-                    categories[current_category].append(image_url)
-
-            # Also check for images in YAML sections
-            elif 'name:' in line and '@sha256:' in line:
-                image_match = re.search(r'([a-zA-Z0-9.-]+(?:\:[0-9]+)?/[a-zA-Z0-9._/-]+@sha256:[a-f0-9]{64})', line)
-                if image_match:
-                    image_url = image_match.group(1)
-                    if current_category not in categories:
-                        categories[current_category] = []
-                    categories[current_category].append(image_url)
-
-        return categories
\ No newline at end of file
+        return current_category
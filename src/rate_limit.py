@@ -0,0 +1,183 @@
+"""Rate-limit-aware request scheduling for the GitHub API."""
+
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import requests
+
+# Statuses that GitHub documents as transient or as secondary rate limits
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class SchedulerStats:
+    """Counters describing how the scheduler paced requests."""
+    requests: int = 0
+    retries: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    token_rotations: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Get a plain-dict snapshot of the counters."""
+        return asdict(self)
+
+
+@dataclass
+class TokenState:
+    """Primary rate-limit state tracked per credential."""
+    token: Optional[str]
+    remaining: int = 5000
+    reset: float = 0.0
+
+    def is_exhausted(self, now: float) -> bool:
+        """Check whether this credential should not be used until reset."""
+        return self.remaining <= 10 and now < self.reset
+
+
+class TokenBucket:
+    """Token-bucket budget that smooths request bursts."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class RequestScheduler:
+    """Schedules GitHub requests across a token budget and credential pool.
+
+    Requests draw from a shared token bucket, use whichever credential has
+    the most primary rate limit left, and are retried with jittered
+    exponential backoff on 5xx, 429 and secondary-limit 403 responses.
+    ``Retry-After`` and ``X-RateLimit-Reset`` are honored when present.
+    """
+
+    def __init__(self, tokens: Optional[List[Optional[str]]] = None,
+                 requests_per_second: float = 10.0, burst: int = 20,
+                 max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self._states = [TokenState(token) for token in (tokens or [None])]
+        self._bucket = TokenBucket(requests_per_second, burst)
+        self._lock = threading.Lock()
+        self._last_state: Optional[TokenState] = None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = SchedulerStats()
+
+    def send(self, session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None,
+             stream: bool = False, timeout: Optional[float] = None) -> requests.Response:
+        """Send a GET request, waiting and retrying as the rate limits require."""
+        for attempt in range(self.max_retries + 1):
+            state = self._acquire()
+
+            request_headers = dict(headers or {})
+            if state.token:
+                request_headers['Authorization'] = f'token {state.token}'
+
+            try:
+                response = session.get(url, headers=request_headers, stream=stream, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._retry_wait(self._backoff(attempt))
+                continue
+
+            self._update_state(state, response)
+
+            delay = self._retry_delay(state, response, attempt)
+            if delay is None or attempt == self.max_retries:
+                return response
+
+            response.close()
+            self._retry_wait(delay)
+
+        return response
+
+    def _acquire(self) -> TokenState:
+        """Wait for budget and pick the credential with the most requests left."""
+        with self._lock:
+            self.stats.requests += 1
+            budget_wait = self._bucket.reserve()
+
+            now = time.time()
+            available = [s for s in self._states if not s.is_exhausted(now)]
+            if available:
+                state = max(available, key=lambda s: s.remaining)
+                reset_wait = 0.0
+            else:
+                state = min(self._states, key=lambda s: s.reset)
+                reset_wait = state.reset - now + 1
+
+            if self._last_state is not None and state is not self._last_state:
+                self.stats.token_rotations += 1
+            self._last_state = state
+
+        self._wait(max(budget_wait, reset_wait))
+        return state
+
+    def _update_state(self, state: TokenState, response: requests.Response) -> None:
+        """Record the primary rate-limit headers for a credential."""
+        with self._lock:
+            state.remaining = int(response.headers.get('X-RateLimit-Remaining', state.remaining))
+            state.reset = float(response.headers.get('X-RateLimit-Reset', state.reset))
+
+    def _retry_delay(self, state: TokenState, response: requests.Response, attempt: int) -> Optional[float]:
+        """Get the delay before retrying a response, or None if it is final."""
+        status = response.status_code
+        is_rate_limited = status == 403 and (
+            response.headers.get('X-RateLimit-Remaining') == '0'
+            or 'Retry-After' in response.headers
+            or 'rate limit' in response.text.lower()
+        )
+        if status not in RETRYABLE_STATUSES and not is_rate_limited:
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            # Another credential may still have budget; otherwise wait for reset
+            with self._lock:
+                if any(not s.is_exhausted(time.time()) for s in self._states if s is not state):
+                    return 0.0
+            return max(0.0, state.reset - time.time() + 1)
+
+        return self._backoff(attempt)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_wait(self, delay: float) -> None:
+        """Count a retry and wait before sending it."""
+        with self._lock:
+            self.stats.retries += 1
+        self._wait(delay)
+
+    def _wait(self, delay: float) -> None:
+        """Sleep and record the wait."""
+        if delay <= 0:
+            return
+        with self._lock:
+            self.stats.waits += 1
+            self.stats.wait_seconds += delay
+        time.sleep(delay)
@@ -0,0 +1,274 @@
+"""Registry v2 API client for image manifests and mirror size calculation."""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import ManifestCache
+from exceptions import RegistryError
+from models import ImageReference, MirrorSize
+
+# Manifest lists / image indexes first, so multi-arch images resolve to all platforms
+INDEX_MEDIA_TYPES = [
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+]
+MANIFEST_MEDIA_TYPES = INDEX_MEDIA_TYPES + [
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+]
+
+AUTH_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+def default_auth_files() -> List[str]:
+    """Credential files in the order podman and skopeo consult them."""
+    paths = []
+    if os.environ.get('REGISTRY_AUTH_FILE'):
+        paths.append(os.environ['REGISTRY_AUTH_FILE'])
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        paths.append(os.path.join(os.environ['XDG_RUNTIME_DIR'], 'containers', 'auth.json'))
+    paths.append(os.path.expanduser('~/.docker/config.json'))
+    return paths
+
+
+def load_credentials(paths: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """Read (username, password) pairs from containers-auth.json or docker config files.
+
+    Keys are a registry, optionally followed by a repository path. Earlier
+    files win, and missing or unreadable files are skipped.
+    """
+    credentials: Dict[str, Tuple[str, str]] = {}
+    for path in paths:
+        try:
+            with open(os.path.expanduser(path), 'r') as f:
+                auths = json.load(f).get('auths') or {}
+        except (OSError, ValueError, AttributeError):
+            continue
+        for key, entry in auths.items():
+            if not isinstance(entry, dict):
+                continue
+            if entry.get('auth'):
+                try:
+                    username, _, password = base64.b64decode(entry['auth']).decode('utf-8').partition(':')
+                except ValueError:
+                    continue
+            elif entry.get('username'):
+                username, password = entry['username'], entry.get('password', '')
+            else:
+                continue
+            credentials.setdefault(_auth_key(key), (username, password))
+    return credentials
+
+
+def _auth_key(key: str) -> str:
+    """Normalize an auth file key such as https://index.docker.io/v1/ to registry[/path]."""
+    key = re.sub(r'^https?://', '', key).rstrip('/')
+    key = re.sub(r'/v[12]$', '', key)
+    return 'docker.io' + key[len('index.docker.io'):] if key.startswith('index.docker.io') else key
+
+
+class RegistryClient:
+    """Fetches image manifests over the Registry v2 API.
+
+    Registries that answer 401 are retried with a bearer token from the
+    realm in their ``WWW-Authenticate`` challenge, requested with the
+    registry's credentials when ``credentials`` has them and anonymously
+    otherwise; basic challenges are answered with the credentials
+    directly. Manifests
+    fetched by digest are verified and kept in an optional per-digest disk
+    cache, so repeated runs only fetch digests they have not seen.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: int = 8, timeout: float = 30,
+                 insecure_registries: Optional[List[str]] = None,
+                 credentials: Optional[Dict[str, Tuple[str, str]]] = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Registries served over plain HTTP, such as a local registry:2
+        self.insecure_registries = set(insecure_registries or [])
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.cache = ManifestCache(cache_dir) if cache_dir else None
+        # (username, password) per registry or registry/repository path
+        self.credentials = credentials or {}
+
+        # Authorization headers per (registry, repository), shared by all fetch threads
+        self._authorizations: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        # Blob sizes per image digest, so overlapping image sets are only sized once
+        self._blobs: Dict[str, Dict[str, int]] = {}
+
+    def get_manifest(self, registry: str, repository: str, reference: str) -> Dict:
+        """Fetch the manifest of a digest or tag in a repository."""
+        is_digest = reference.startswith('sha256:')
+        body = self.cache.get(reference) if self.cache and is_digest else None
+        if body is None:
+            body = self._request(registry, repository, f"manifests/{reference}")
+            if is_digest:
+                if hashlib.sha256(body).hexdigest() != reference.split(':', 1)[1]:
+                    raise RegistryError(f"Manifest for {registry}/{repository}@{reference} does not match its digest")
+                if self.cache:
+                    self.cache.put(reference, body)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise RegistryError(f"Invalid manifest for {registry}/{repository}:{reference}: {e}")
+
+    def image_blobs(self, registry: str, repository: str, reference: str) -> Dict[str, int]:
+        """Map every layer and config blob of an image to its compressed size.
+
+        For a manifest list or image index, the blobs of all platform
+        manifests are included, since mirroring copies every platform.
+        """
+        manifest = self.get_manifest(registry, repository, reference)
+        blobs: Dict[str, int] = {}
+        if manifest.get('mediaType') in INDEX_MEDIA_TYPES or 'manifests' in manifest:
+            for child in manifest.get('manifests', []):
+                blobs.update(self.image_blobs(registry, repository, child['digest']))
+            return blobs
+
+        for layer in manifest.get('layers', []):
+            blobs[layer['digest']] = int(layer.get('size', 0))
+        config = manifest.get('config')
+        if config:
+            blobs[config['digest']] = int(config.get('size', 0))
+        return blobs
+
+    def mirror_size(self, images: Iterable[ImageReference]) -> MirrorSize:
+        """Compute the layer-deduplicated download size of a set of images.
+
+        Each unique digest is sized once, trying its references in turn
+        until one registry answers; tag-only references are sized by tag.
+        """
+        references: Dict[str, List[ImageReference]] = {}
+        for image in images:
+            references.setdefault(image.digest or image.full_reference, []).append(image)
+
+        blobs: Dict[str, int] = {}
+        naive_bytes = 0
+        images_sized = 0
+        unresolved = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._blobs_for, key, refs): refs for key, refs in references.items()}
+            for future in as_completed(futures):
+                try:
+                    image_blobs = future.result()
+                except Exception as e:
+                    unresolved.append(f"{futures[future][0].full_reference}: {e}")
+                    continue
+                images_sized += 1
+                naive_bytes += sum(image_blobs.values())
+                blobs.update(image_blobs)
+
+        return MirrorSize(
+            total_bytes=sum(blobs.values()),
+            naive_bytes=naive_bytes,
+            unique_blobs=len(blobs),
+            images_sized=images_sized,
+            unresolved=sorted(unresolved)
+        )
+
+    def _blobs_for(self, key: str, refs: List[ImageReference]) -> Dict[str, int]:
+        """Size one image from the first of its references that can be fetched."""
+        if key in self._blobs:
+            return self._blobs[key]
+
+        error = None
+        tried = set()
+        for image in refs:
+            location = (image.registry, f"{image.namespace}/{image.repository}")
+            if location in tried:
+                continue
+            tried.add(location)
+            try:
+                image_blobs = self.image_blobs(*location, image.digest or image.tag or 'latest')
+            except (RegistryError, requests.RequestException) as e:
+                error = e
+                continue
+            if image.digest:
+                self._blobs[key] = image_blobs
+            return image_blobs
+        raise error
+
+    def _request(self, registry: str, repository: str, path: str) -> bytes:
+        """GET a registry API path, authenticating on 401."""
+        scheme = 'http' if registry in self.insecure_registries else 'https'
+        url = f"{scheme}://{registry}/v2/{repository}/{path}"
+        headers = {'Accept': ', '.join(MANIFEST_MEDIA_TYPES)}
+
+        with self._lock:
+            authorization = self._authorizations.get((registry, repository))
+        if authorization:
+            headers['Authorization'] = authorization
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        # A missing or expired token is answered with a fresh challenge
+        if response.status_code == 401:
+            headers['Authorization'] = self._authorize(
+                registry, repository, response.headers.get('WWW-Authenticate', ''))
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 404:
+            raise RegistryError(f"Manifest not found: {url}")
+        elif response.status_code in (401, 403) and not self._credentials_for(registry, repository):
+            raise RegistryError(f"{registry} requires credentials for {repository}; "
+                                f"log in with podman/docker or set REGISTRY_AUTH_FILE")
+        elif response.status_code != 200:
+            raise RegistryError(f"Registry error {response.status_code} for {url}")
+        return response.content
+
+    def _credentials_for(self, registry: str, repository: str) -> Optional[Tuple[str, str]]:
+        """Get the credentials of the most specific auth key matching a repository."""
+        path = f"{registry}/{repository}"
+        while True:
+            if path in self.credentials:
+                return self.credentials[path]
+            if '/' not in path:
+                return None
+            path = path.rsplit('/', 1)[0]
+
+    def _authorize(self, registry: str, repository: str, challenge: str) -> str:
+        """Answer a WWW-Authenticate challenge, returning the Authorization header to send."""
+        scheme, _, params = challenge.partition(' ')
+        auth_params = dict(AUTH_PARAM_RE.findall(params))
+        credentials = self._credentials_for(registry, repository)
+
+        if scheme.lower() == 'basic' and credentials:
+            encoded = base64.b64encode(':'.join(credentials).encode('utf-8')).decode('ascii')
+            authorization = f"Basic {encoded}"
+        elif scheme.lower() == 'bearer' and 'realm' in auth_params:
+            authorization = f"Bearer {self._token(registry, repository, auth_params, credentials)}"
+        else:
+            raise RegistryError(f"{registry} requires credentials for {repository}")
+
+        with self._lock:
+            self._authorizations[(registry, repository)] = authorization
+        return authorization
+
+    def _token(self, registry: str, repository: str, auth_params: Dict[str, str],
+               credentials: Optional[Tuple[str, str]]) -> str:
+        """Obtain a pull token from the realm of a bearer challenge, anonymously without credentials."""
+        query = {'scope': auth_params.get('scope') or f"repository:{repository}:pull"}
+        if 'service' in auth_params:
+            query['service'] = auth_params['service']
+        response = self.session.get(auth_params['realm'], params=query, auth=credentials, timeout=self.timeout)
+        if response.status_code != 200:
+            kind = 'Token' if credentials else 'Anonymous token'
+            raise RegistryError(f"{kind} request to {registry} failed with {response.status_code}")
+
+        data = response.json()
+        token = data.get('token') or data.get('access_token')
+        if not token:
+            raise RegistryError(f"Token response from {registry} has no token")
+        return token
@@ -18,7 +18,7 @@ except ImportError:
         result += "\n".join([" | ".join(map(str, row)) for row in data])
         return result
 
-from models import Analysis, ComponentInfo, Report
+from models import Analysis, ComponentInfo, MatrixResult, MirrorPlan, Report
 
 
 class ReportGenerator:
@@ -45,8 +45,125 @@ class ReportGenerator:
             format="markdown"
         )
 
+    def generate_matrix_report(self, results: List[MatrixResult], format: str = "markdown") -> str:
+        """Generate a combined report for every pair of a version matrix."""
+        if format == "json":
+            return json.dumps([
+                {
+                    "rhoai_version": result.rhoai_version,
+                    "ocp_version": result.ocp_version,
+                    "error": result.error,
+                    "warnings": result.warnings,
+                    "report": self._json_report_data(result.analysis) if result.analysis else None
+                }
+                for result in results
+            ], indent=2)
+
+        matrix_data = []
+        for result in results:
+            analysis = result.analysis
+            if analysis:
+                unique_digests = len({img.digest for img in analysis.images if img.digest})
+                matrix_data.append([
+                    f"RHOAI {result.rhoai_version} / OCP {result.ocp_version}", analysis.total_images,
+                    len(analysis.infrastructure_images), len(analysis.workload_images),
+                    unique_digests, len(analysis.components), "OK"
+                ])
+            else:
+                matrix_data.append([f"RHOAI {result.rhoai_version} / OCP {result.ocp_version}",
+                                    "-", "-", "-", "-", "-", f"Failed: {result.error}"])
+
+        report = "# RHOAI Version Matrix Report\n\n" + tabulate(
+            matrix_data,
+            headers=["Versions", "Total Images", "Infrastructure", "Workload",
+                     "Unique Digests", "Components", "Status"],
+            tablefmt="pipe"
+        ) + "\n"
+
+        for result in results:
+            if result.analysis:
+                report += "\n" + self._generate_summary_report(result.analysis) + "\n"
+            for warning in result.warnings:
+                report += f"\n> RHOAI {result.rhoai_version} / OCP {result.ocp_version}: {warning}\n"
+
+        return report
+
+    def generate_mirror_plan_report(self, plan: MirrorPlan, format: str = "markdown") -> str:
+        """Generate a report of a multi-version mirror plan and its per-version deltas."""
+        if format == "json":
+            return json.dumps({
+                "summary": {
+                    "total_images": plan.total_images,
+                    "existing_images": plan.existing_images,
+                    "images_to_mirror": len(plan.images)
+                },
+                "deltas": [
+                    {
+                        "rhoai_version": delta.rhoai_version,
+                        "ocp_version": delta.ocp_version,
+                        "total_images": delta.total_images,
+                        "already_mirrored": delta.already_mirrored,
+                        "from_earlier_versions": delta.from_earlier_versions,
+                        "new_images": delta.new_images,
+                        "skipped": delta.skipped
+                    }
+                    for delta in plan.deltas
+                ],
+                "images": plan.images
+            }, indent=2)
+
+        versions = ", ".join(f"RHOAI {delta.rhoai_version} / OCP {delta.ocp_version}" for delta in plan.deltas)
+        report = f"""# RHOAI Mirror Plan
+
+## Summary
+- **Versions**: {versions}
+- **Unique Images**: {plan.total_images} across all versions
+- **Already Mirrored**: {plan.total_images - len(plan.images)} (existing mirror set of {plan.existing_images} references)
+- **To Mirror**: {len(plan.images)} images
+"""
+        skipped = sorted({reference for delta in plan.deltas for reference in delta.skipped})
+        if skipped:
+            report += f"- **Skipped**: {len(skipped)} references without a registry, which cannot be pulled\n"
+
+        report += "\n## Per-Version Deltas\n"
+        delta_data = [
+            [f"RHOAI {delta.rhoai_version} / OCP {delta.ocp_version}", delta.total_images,
+             delta.already_mirrored, delta.from_earlier_versions, len(delta.new_images), len(delta.skipped)]
+            for delta in plan.deltas
+        ]
+        report += tabulate(
+            delta_data,
+            headers=["Versions", "Images", "Already Mirrored", "From Earlier Versions", "New", "Skipped"],
+            tablefmt="pipe"
+        ) + "\n"
+
+        for delta in plan.deltas:
+            if delta.new_images:
+                report += f"\n### New in RHOAI {delta.rhoai_version} / OCP {delta.ocp_version} ({len(delta.new_images)})\n"
+                for reference in delta.new_images:
+                    report += f"- {reference}\n"
+
+        if skipped:
+            report += f"\n### Skipped ({len(skipped)})\n"
+            for reference in skipped:
+                report += f"- {reference}\n"
+
+        return report
+
     def _generate_json_report(self, analysis: Analysis) -> Report:
         """Generate JSON-formatted report."""
+        json_content = json.dumps(self._json_report_data(analysis), indent=2)
+
+        return Report(
+            analysis=analysis,
+            summary=json_content,
+            detailed_breakdown=json_content,
+            security_report=json_content,
+            format="json"
+        )
+
+    def _json_report_data(self, analysis: Analysis) -> Dict:
+        """Structured report data for one analysis."""
         report_data = {
             "rhoai_version": analysis.rhoai_version,
             "ocp_version": analysis.ocp_version,
@@ -89,16 +206,15 @@ class ReportGenerator:
                 "recommendations": analysis.security_insights.recommendations
             }
         }
-
-        json_content = json.dumps(report_data, indent=2)
-
-        return Report(
-            analysis=analysis,
-            summary=json_content,
-            detailed_breakdown=json_content,
-            security_report=json_content,
-            format="json"
-        )
+        if analysis.mirror_size:
+            report_data["summary"]["mirror_size"] = {
+                "total_bytes": analysis.mirror_size.total_bytes,
+                "naive_bytes": analysis.mirror_size.naive_bytes,
+                "unique_blobs": analysis.mirror_size.unique_blobs,
+                "images_sized": analysis.mirror_size.images_sized,
+                "unresolved": analysis.mirror_size.unresolved
+            }
+        return report_data
 
     def _generate_summary_report(self, analysis: Analysis) -> str:
         """Create executive summary with key metrics."""
@@ -109,8 +225,7 @@ class ReportGenerator:
 
         base_os_summary = ", ".join([f"{os} ({count})" for os, count in base_os_counts.items()])
 
-        # Calculate estimated total size (rough estimate)
-        estimated_size_gb = analysis.total_images * 0.1  # Assume 100MB average per image
+        size_summary = self._size_summary(analysis)
 
         summary = f"""# RHOAI {analysis.rhoai_version} / OCP {analysis.ocp_version} Container Image Report
 
@@ -118,7 +233,7 @@ class ReportGenerator:
 - **Total Images**: {analysis.total_images} ({len(analysis.infrastructure_images)} infrastructure + {len(analysis.workload_images)} workload)
 - **Registries**: {', '.join([f"{reg} ({count})" for reg, count in analysis.registry_analysis.registry_counts.items()])}
 - **Base OS**: {base_os_summary}
-- **Estimated Size**: ~{estimated_size_gb:.1f}GB total download
+- {size_summary}
 - **Components**: {len(analysis.components)} functional areas identified
 
 ## Component Overview
@@ -172,11 +287,32 @@ class ReportGenerator:
 ## Key Changes
 - **Added**: {len(analysis.comparison.added_images)} new images
 - **Removed**: {len(analysis.comparison.removed_images)} deprecated images
+- **Updated**: {len(analysis.comparison.updated_images)} rebuilt images
 - **Unchanged**: {len(analysis.comparison.unchanged_images)} existing images
 """
 
         return summary
 
+    def _size_summary(self, analysis: Analysis) -> str:
+        """Summary line for the download size, from registry manifests when available."""
+        mirror_size = analysis.mirror_size
+        if not mirror_size or not mirror_size.images_sized:
+            # Rough estimate, assuming 100MB average per image
+            summary = f"**Estimated Size**: ~{analysis.total_images * 0.1:.1f}GB total download"
+            if mirror_size:
+                summary += (f" (**none of {len(mirror_size.unresolved)} images could be sized** "
+                            f"from registry manifests)")
+            return summary
+
+        summary = f"**Mirror Size**: {mirror_size.total_bytes / 1e9:.1f}GB"
+        if mirror_size.unresolved:
+            unresolved = len(mirror_size.unresolved)
+            summary += (f" (**{unresolved} of {unresolved + mirror_size.images_sized} images could not be "
+                        f"sized**, so this is a lower bound)")
+        summary += (f" compressed with shared layers counted once ({mirror_size.naive_bytes / 1e9:.1f}GB "
+                    f"summed per image, {mirror_size.unique_blobs} unique blobs)")
+        return summary
+
     def _generate_detailed_report(self, analysis: Analysis) -> str:
         """Full breakdown by component and category."""
         detailed = f"""
@@ -0,0 +1,117 @@
+"""Local repository snapshots for bulk multi-version reads."""
+
+import os
+import tarfile
+from typing import Dict, IO, List, Optional
+
+from exceptions import VersionNotFoundError
+
+
+class RepositorySnapshot:
+    """Selected subtrees of a repository extracted at a pinned commit.
+
+    The snapshot is built from one recursive Git Trees listing plus one
+    tarball download, after which file reads and directory listings are
+    served locally without further API calls.
+    """
+
+    def __init__(self, repo: str, commit_sha: str, root_dir: str,
+                 tree: List[Dict], prefixes: List[str], truncated: bool = False):
+        self.repo = repo
+        self.commit_sha = commit_sha
+        self.root_dir = root_dir
+        self.prefixes = prefixes
+        # A truncated tree listing cannot prove that a path is missing
+        self.truncated = truncated
+
+        self._entries = {}
+        self._children = {}
+        for entry in tree:
+            path = entry['path']
+            if not self.covers(path):
+                continue
+            self._entries[path] = entry
+            parent = path.rsplit('/', 1)[0] if '/' in path else ''
+            self._children.setdefault(parent, []).append(entry)
+
+    def covers(self, path: str) -> bool:
+        """Check whether a path falls inside the snapshotted subtrees."""
+        return any(path.startswith(prefix) for prefix in self.prefixes)
+
+    def is_authoritative(self, path: str) -> bool:
+        """Check whether the snapshot can answer for a path, including misses."""
+        if path in self._entries:
+            return True
+        return self.covers(path) and not self.truncated
+
+    def read_file(self, file_path: str) -> str:
+        """Read a file from the snapshot."""
+        with self.open_file(file_path) as f:
+            return f.read().decode('utf-8')
+
+    def open_file(self, file_path: str) -> IO[bytes]:
+        """Open a snapshotted file for binary reading."""
+        entry = self._entries.get(file_path)
+        if not entry or entry['type'] != 'blob':
+            raise VersionNotFoundError(f"Resource not found: {self.repo}/{file_path}@{self.commit_sha[:12]}")
+        return open(os.path.join(self.root_dir, file_path), 'rb')
+
+    def blob_sha(self, file_path: str) -> Optional[str]:
+        """Git blob SHA of a snapshotted file, from the tree listing."""
+        entry = self._entries.get(file_path)
+        return entry.get('sha') if entry and entry['type'] == 'blob' else None
+
+    def list_directory(self, dir_path: str) -> List[Dict]:
+        """List a directory using the GitHub contents API entry format."""
+        dir_path = dir_path.strip('/')
+        listing = []
+        for entry in self._children.get(dir_path, []):
+            listing.append({
+                'name': entry['path'].rsplit('/', 1)[-1],
+                'path': entry['path'],
+                'sha': entry.get('sha'),
+                'size': entry.get('size', 0),
+                'type': 'dir' if entry['type'] == 'tree' else 'file'
+            })
+        return listing
+
+    @staticmethod
+    def extract_tarball(fileobj: IO[bytes], root_dir: str, prefixes: List[str]) -> int:
+        """Extract matching members of a GitHub tarball stream into root_dir."""
+        extracted = 0
+        os.makedirs(root_dir, exist_ok=True)
+        with tarfile.open(fileobj=fileobj, mode='r|gz') as archive:
+            for member in archive:
+                # GitHub archives wrap everything in an "<owner>-<repo>-<sha>/" directory
+                parts = member.name.split('/', 1)
+                if len(parts) < 2 or not member.isfile():
+                    continue
+                path = parts[1]
+                if not any(path.startswith(prefix) for prefix in prefixes):
+                    continue
+                if os.path.isabs(path) or '..' in path.split('/'):
+                    continue
+
+                source = archive.extractfile(member)
+                if source is None:
+                    continue
+                target = os.path.join(root_dir, path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, 'wb') as f:
+                    while True:
+                        chunk = source.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                extracted += 1
+        return extracted
+
+    @staticmethod
+    def marker_path(root_dir: str) -> str:
+        """Path of the marker written once extraction has completed."""
+        return os.path.join(root_dir, '.snapshot-complete')
+
+    @classmethod
+    def is_extracted(cls, root_dir: Optional[str]) -> bool:
+        """Check whether a snapshot directory holds a complete extraction."""
+        return bool(root_dir) and os.path.exists(cls.marker_path(root_dir))
@@ -0,0 +1,337 @@
+"""Source backends serving RHOAI catalogs, helper lists and version listings."""
+
+import io
+import os
+import re
+import subprocess
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, IO, List, Optional, Tuple
+
+from exceptions import RHOAIReporterError, VersionNotFoundError
+
+BUILD_CONFIG_REPO = "red-hat-data-services/RHOAI-Build-Config"
+DISCONNECTED_HELPER_REPO = "red-hat-data-services/rhoai-disconnected-install-helper"
+
+# Subtrees of each repository that the backends read
+BUILD_CONFIG_PREFIXES = ['catalog/', 'pcc/']
+DISCONNECTED_HELPER_PREFIXES = ['']
+
+
+@dataclass
+class SourceFile:
+    """An opened repository file and, when the backend knows it, its git blob SHA."""
+    path: str
+    stream: IO[bytes]
+    blob_sha: Optional[str] = None
+
+    def __enter__(self) -> 'SourceFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stream.close()
+
+
+def version_key(version: str) -> List[int]:
+    """Sort key for dotted numeric versions."""
+    return [int(x) for x in version.split('.')]
+
+
+def snapshot_refs(ref: str, build_config_repo: str = BUILD_CONFIG_REPO,
+                  helper_repo: str = DISCONNECTED_HELPER_REPO) -> Dict[str, str]:
+    """Map each repository to its git ref from a --snapshot value.
+
+    A plain ref such as a branch, tag or HEAD applies to both repositories.
+    A commit SHA exists in only one of them, so ``build=<ref>,helper=<ref>``
+    sets each separately; a repository left out reads HEAD.
+    """
+    if '=' not in ref:
+        return {build_config_repo: ref, helper_repo: ref}
+
+    keys = {'build': build_config_repo, 'helper': helper_repo}
+    refs = {build_config_repo: 'HEAD', helper_repo: 'HEAD'}
+    for entry in ref.split(','):
+        key, _, value = entry.partition('=')
+        key, value = key.strip(), value.strip()
+        if key not in keys or not value:
+            raise RHOAIReporterError(f"Invalid snapshot ref '{entry}'; expected build=<ref> or helper=<ref>")
+        refs[keys[key]] = value
+    return refs
+
+
+class SourceBackend(ABC):
+    """Serves catalog content, helper content and version listings.
+
+    Subclasses only provide file and directory access for a repository;
+    the RHOAI repository layout and its version fallbacks live here.
+    """
+
+    def __init__(self, build_config_repo: str = BUILD_CONFIG_REPO,
+                 helper_repo: str = DISCONNECTED_HELPER_REPO):
+        self.build_config_repo = build_config_repo
+        self.helper_repo = helper_repo
+        # Optional ResolutionCache memoizing fallback paths and version listings
+        self.resolutions = None
+
+    @abstractmethod
+    def open_file(self, repo: str, file_path: str) -> IO[bytes]:
+        """Open a repository file for binary reading."""
+
+    @abstractmethod
+    def list_directory(self, repo: str, dir_path: str) -> List[Dict]:
+        """List a directory as GitHub contents API style entries ('name', 'type')."""
+
+    def blob_sha(self, repo: str, file_path: str) -> Optional[str]:
+        """Git blob SHA of a file if it is known without reading the file."""
+        return None
+
+    def read_file(self, repo: str, file_path: str) -> str:
+        """Read a repository file as text."""
+        with self.open_file(repo, file_path) as f:
+            return f.read().decode('utf-8')
+
+    def get_olm_catalog(self, rhoai_version: str, ocp_version: str) -> str:
+        """Fetch OLM catalog content (YAML or File-Based Catalog JSON)."""
+        with self.open_olm_catalog(rhoai_version, ocp_version) as source_file:
+            return source_file.stream.read().decode('utf-8')
+
+    def get_disconnected_helper(self, rhoai_version: str) -> str:
+        """Fetch disconnected helper markdown content."""
+        with self.open_disconnected_helper(rhoai_version) as source_file:
+            return source_file.stream.read().decode('utf-8')
+
+    def open_olm_catalog(self, rhoai_version: str, ocp_version: str) -> SourceFile:
+        """Open the OLM catalog (YAML or File-Based Catalog JSON) as a binary stream."""
+        candidates = [
+            # Specific version path first (YAML or FBC JSON), then the pre-compiled catalog fallback
+            f"catalog/rhoai-{rhoai_version}/v{ocp_version}/rhods-operator/catalog.yaml",
+            f"catalog/rhoai-{rhoai_version}/v{ocp_version}/rhods-operator/catalog.json",
+            f"pcc/catalog-v{ocp_version}.yaml",
+        ]
+        source_file = self._open_first(self.build_config_repo, f"olm:{rhoai_version}:{ocp_version}", candidates)
+        if source_file is None:
+            raise VersionNotFoundError(
+                f"No OLM catalog found for RHOAI {rhoai_version} / OCP {ocp_version}"
+            )
+        return source_file
+
+    def open_disconnected_helper(self, rhoai_version: str) -> SourceFile:
+        """Open the disconnected helper markdown as a binary stream."""
+        candidates = [
+            f"rhoai-{rhoai_version}.md",
+            # Legacy RHODS naming
+            f"rhods-{rhoai_version}.md",
+        ]
+        source_file = self._open_first(self.helper_repo, f"helper:{rhoai_version}", candidates)
+        if source_file is None:
+            raise VersionNotFoundError(f"No disconnected helper found for RHOAI {rhoai_version}")
+        return source_file
+
+    def _open_file(self, repo: str, file_path: str) -> SourceFile:
+        """Open a repository file together with its blob SHA, if known."""
+        stream = self.open_file(repo, file_path)
+        return SourceFile(file_path, stream, self.blob_sha(repo, file_path))
+
+    def _open_first(self, repo: str, lookup_key: str, candidates: List[str]) -> Optional[SourceFile]:
+        """Open the first existing candidate path, using the resolution memo.
+
+        A previously resolved path is opened directly, and candidates known to
+        be missing are skipped, so repeat runs make one request per source file.
+        """
+        memo = self.resolutions
+        resolved = memo.get(f"resolved:{repo}:{lookup_key}") if memo else None
+        if resolved:
+            try:
+                return self._open_file(repo, resolved)
+            except VersionNotFoundError:
+                memo.discard(f"resolved:{repo}:{lookup_key}")
+
+        for file_path in candidates:
+            if file_path == resolved or (memo and memo.get(f"missing:{repo}:{file_path}")):
+                continue
+            try:
+                source_file = self._open_file(repo, file_path)
+            except VersionNotFoundError:
+                if memo:
+                    memo.set(f"missing:{repo}:{file_path}", True)
+                continue
+            if memo:
+                memo.set(f"resolved:{repo}:{lookup_key}", file_path)
+            return source_file
+
+        return None
+
+    def get_latest_versions(self) -> Tuple[str, str]:
+        """Determine latest RHOAI and OCP versions available."""
+        if self.resolutions:
+            cached = self.resolutions.get('latest_versions')
+            if cached:
+                return tuple(cached)
+
+        latest = self._find_latest_versions()
+        if self.resolutions:
+            self.resolutions.set('latest_versions', list(latest))
+        return latest
+
+    def get_version_matrix(self) -> List[Tuple[str, str]]:
+        """List every RHOAI/OCP pair that has a catalog directory, oldest first."""
+        pairs = []
+        for rhoai_info in self.list_directory(self.build_config_repo, "catalog"):
+            rhoai_match = re.match(r'rhoai-(\d+\.\d+)$', rhoai_info['name'])
+            if rhoai_info['type'] != 'dir' or not rhoai_match:
+                continue
+            for ocp_info in self.list_directory(self.build_config_repo, f"catalog/{rhoai_info['name']}"):
+                ocp_match = re.match(r'v(\d+\.\d+)$', ocp_info['name'])
+                if ocp_info['type'] == 'dir' and ocp_match:
+                    pairs.append((rhoai_match.group(1), ocp_match.group(1)))
+
+        pairs.sort(key=lambda pair: (version_key(pair[0]), version_key(pair[1])))
+        return pairs
+
+    def _find_latest_versions(self) -> Tuple[str, str]:
+        """List both repositories to find the latest RHOAI and OCP versions."""
+        # Get latest RHOAI version from disconnected helper
+        files = self.list_directory(self.helper_repo, "")
+
+        rhoai_versions = []
+        for file_info in files:
+            if file_info['type'] == 'file':
+                match = re.match(r'rhoai-(\d+\.\d+)\.md', file_info['name'])
+                if match:
+                    rhoai_versions.append(match.group(1))
+
+        if not rhoai_versions:
+            raise VersionNotFoundError("No RHOAI versions found")
+
+        # Sort versions and get latest
+        rhoai_versions.sort(key=version_key)
+        latest_rhoai = rhoai_versions[-1]
+
+        # Get latest OCP version from build config
+        catalog_dirs = self.list_directory(self.build_config_repo, f"catalog/rhoai-{latest_rhoai}")
+
+        ocp_versions = []
+        for dir_info in catalog_dirs:
+            if dir_info['type'] == 'dir':
+                match = re.match(r'v(\d+\.\d+)', dir_info['name'])
+                if match:
+                    ocp_versions.append(match.group(1))
+
+        if not ocp_versions:
+            # Fallback to common latest version
+            return latest_rhoai, "4.20"
+
+        ocp_versions.sort(key=version_key)
+        latest_ocp = ocp_versions[-1]
+
+        return latest_rhoai, latest_ocp
+
+
+class GitHubSourceBackend(SourceBackend):
+    """Source backend reading both repositories through the GitHub API."""
+
+    def __init__(self, client, build_config_repo: str = BUILD_CONFIG_REPO,
+                 helper_repo: str = DISCONNECTED_HELPER_REPO):
+        super().__init__(build_config_repo, helper_repo)
+        self.client = client
+
+    def open_file(self, repo: str, file_path: str) -> IO[bytes]:
+        """Open a repository file through the API or an active snapshot."""
+        return self.client.open_file(repo, file_path)
+
+    def blob_sha(self, repo: str, file_path: str) -> Optional[str]:
+        """Blob SHA from the tree listing of an active snapshot."""
+        snapshot = self.client.snapshots.get(repo)
+        return snapshot.blob_sha(file_path) if snapshot else None
+
+    def list_directory(self, repo: str, dir_path: str) -> List[Dict]:
+        """List a repository directory through the API or an active snapshot."""
+        return self.client.list_directory(repo, dir_path)
+
+    def snapshot(self, ref: str = 'HEAD') -> None:
+        """Snapshot both repositories, each at its ref from ``snapshot_refs``, so later reads are local."""
+        refs = snapshot_refs(ref, self.build_config_repo, self.helper_repo)
+        self.client.snapshot_repository(self.build_config_repo, BUILD_CONFIG_PREFIXES, refs[self.build_config_repo])
+        self.client.snapshot_repository(self.helper_repo, DISCONNECTED_HELPER_PREFIXES, refs[self.helper_repo])
+
+
+class LocalSourceBackend(SourceBackend):
+    """Source backend reading local clones of both repositories.
+
+    Reads the working tree by default. With ``ref`` set, files are read
+    from that commit of each clone via git, so a mirrored bare or shallow
+    checkout can be used without touching its working tree. The ref takes
+    the ``snapshot_refs`` forms, so each clone can be pinned separately.
+    """
+
+    def __init__(self, paths: Dict[str, str], ref: Optional[str] = None,
+                 build_config_repo: str = BUILD_CONFIG_REPO,
+                 helper_repo: str = DISCONNECTED_HELPER_REPO):
+        super().__init__(build_config_repo, helper_repo)
+        self.paths = {repo: os.path.expanduser(path) for repo, path in paths.items()}
+        # Git ref to read per repository; none reads the working trees
+        self.refs = snapshot_refs(ref, build_config_repo, helper_repo) if ref else {}
+
+        for repo in (build_config_repo, helper_repo):
+            if repo not in self.paths:
+                raise RHOAIReporterError(f"No local checkout configured for {repo}")
+            if not os.path.isdir(self.paths[repo]):
+                raise RHOAIReporterError(f"Local checkout not found: {self.paths[repo]}")
+
+    def open_file(self, repo: str, file_path: str) -> IO[bytes]:
+        """Open a file from the working tree or from the configured ref."""
+        root = self.paths[repo]
+        ref = self.refs.get(repo)
+        if ref:
+            content = self._git(root, 'cat-file', 'blob', f"{ref}:{file_path}")
+            if content is None:
+                raise VersionNotFoundError(f"Resource not found: {repo}/{file_path}@{ref}")
+            return io.BytesIO(content)
+
+        try:
+            return open(os.path.join(root, file_path), 'rb')
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            raise VersionNotFoundError(f"Resource not found: {root}/{file_path}")
+
+    def blob_sha(self, repo: str, file_path: str) -> Optional[str]:
+        """Blob SHA at the configured ref; working-tree files may be modified, so have none."""
+        ref = self.refs.get(repo)
+        if not ref:
+            return None
+        output = self._git(self.paths[repo], 'rev-parse', f"{ref}:{file_path}")
+        return output.decode('utf-8').strip() if output else None
+
+    def list_directory(self, repo: str, dir_path: str) -> List[Dict]:
+        """List a directory from the working tree or from the configured ref."""
+        root = self.paths[repo]
+        dir_path = dir_path.strip('/')
+        ref = self.refs.get(repo)
+
+        if ref:
+            treeish = f"{ref}:{dir_path}" if dir_path else ref
+            output = self._git(root, 'ls-tree', treeish)
+            if output is None:
+                return []
+            listing = []
+            for line in output.decode('utf-8').splitlines():
+                meta, name = line.split('\t', 1)
+                obj_type = meta.split()[1]
+                listing.append({'name': name, 'type': 'dir' if obj_type == 'tree' else 'file'})
+            return listing
+
+        try:
+            entries = list(os.scandir(os.path.join(root, dir_path)))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return [
+            {'name': entry.name, 'type': 'dir' if entry.is_dir() else 'file'}
+            for entry in entries
+            if not entry.name.startswith('.')
+        ]
+
+    def _git(self, root: str, *args: str) -> Optional[bytes]:
+        """Run a git plumbing command in a clone, returning None if the object is missing."""
+        result = subprocess.run(['git', '-C', root, *args], capture_output=True)
+        if result.returncode != 0:
+            return None
+        return result.stdout
@@ -0,0 +1,6 @@
+"""Shared pytest setup: the modules under src/ are imported flat, as rhoai_reporter.py does."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,33 @@
+"""Tests for ImageAnalyzer version comparison."""
+
+from analyzer import ImageAnalyzer
+from parsers import OLMCatalogParser
+
+BUNDLE_REPOSITORY = 'registry.redhat.io/rhoai/odh-operator-bundle'
+VLLM_DIGEST = 'sha256:' + 'c' * 64
+
+
+def catalog(version: str, bundle_digest: str) -> str:
+    """A one-bundle catalog whose bundle name carries the version."""
+    return f"""schema: olm.bundle
+name: rhods-operator.{version}
+image: {BUNDLE_REPOSITORY}@{bundle_digest}
+relatedImages:
+- image: quay.io/modh/vllm@{VLLM_DIGEST}
+  name: vllm
+"""
+
+
+def test_bundle_rebuild_is_paired_as_update():
+    parser = OLMCatalogParser()
+    previous = parser.parse_catalog(catalog('2.24.0', 'sha256:' + 'a' * 64))
+    current = parser.parse_catalog(catalog('2.25.0', 'sha256:' + 'b' * 64))
+
+    comparison = ImageAnalyzer().compare_versions(current, previous)
+
+    assert comparison.added_images == []
+    assert comparison.removed_images == []
+    assert [(update.previous.digest, update.current.digest) for update in comparison.updated_images] == [
+        ('sha256:' + 'a' * 64, 'sha256:' + 'b' * 64)
+    ]
+    assert [image.repository for image in comparison.unchanged_images] == ['vllm']
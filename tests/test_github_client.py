@@ -0,0 +1,72 @@
+"""Tests for GitHubAPIClient streaming against a local fake GitHub server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from exceptions import GitHubAPIError
+from github_client import GitHubAPIClient
+from parsers import DisconnectedHelperParser, OLMCatalogParser
+
+DIGEST = 'sha256:' + 'a' * 64
+CATALOG = f"""schema: olm.bundle
+name: rhods-operator.2.25.0
+image: registry.redhat.io/rhoai/odh-operator-bundle@{DIGEST}
+relatedImages:
+- image: quay.io/modh/vllm@{DIGEST}
+  name: vllm
+""".encode('utf-8')
+HELPER = f"# RHOAI 2.25\n\n- quay.io/modh/ray@{DIGEST}\n".encode('utf-8')
+FILES = {
+    '/repos/org/build/contents/catalog.yaml': CATALOG,
+    '/repos/org/helper/contents/rhoai-2.25.md': HELPER,
+}
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Serves FILES as raw contents and answers 500 for anything else."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = FILES.get(self.path)
+        if body is None:
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b'boom')
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def client():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    github = GitHubAPIClient(max_retries=0)
+    github.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield github
+    github.close()
+    server.shutdown()
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_uncached_catalog_stream_parses(client, streaming):
+    with client.open_file('org/build', 'catalog.yaml') as stream:
+        images = OLMCatalogParser(streaming=streaming).parse_catalog(stream)
+    assert [image.repository for image in images] == ['odh-operator-bundle', 'vllm']
+
+
+def test_uncached_helper_stream_parses(client):
+    with client.open_file('org/helper', 'rhoai-2.25.md') as stream:
+        images = DisconnectedHelperParser().parse_markdown(stream)
+    assert [image.repository for image in images] == ['ray']
+
+
+def test_server_error_raises(client):
+    with pytest.raises(GitHubAPIError):
+        client.open_file('org/build', 'missing.yaml')